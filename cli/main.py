@@ -18,22 +18,37 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from utils.event_loop import LOOP_CHOICES, install_event_loop_policy
+from utils.logging_setup import configure_logging
+
 # Set up basic logging for CLI operations
-logging.basicConfig(level=logging.INFO)
+configure_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def parse_args():
-    """Parse command-line arguments for the One_Touch_Plus scraper CLI."""
+    """Parse command-line arguments for the One_Touch_Plus scraper CLI.
+
+    Returns:
+        tuple: The (parser, args) pair, so callers can reuse the parser for usage output.
+    """
     parser = argparse.ArgumentParser(description="One_Touch_Plus Web Scraper CLI")
     parser.add_argument("--url", help="Single URL to scrape", type=str)
     parser.add_argument("--batch", help="Path to a batch file containing URLs to scrape", type=str)
     parser.add_argument("--clean", help="Clean temporary files and exit", action="store_true")
     parser.add_argument("--generate-temp-config", help="Generate a template temp_config.yaml and exit", action="store_true")
-    return parser.parse_args()
+    parser.add_argument("--loop", help="Event loop implementation (default: uvloop if installed)",
+                        choices=LOOP_CHOICES, default="auto")
+    return parser, parser.parse_args()
+
+async def main(parser=None, args=None):
+    """Main asynchronous entry point for running the web scraper.
 
-async def main():
-    """Main asynchronous entry point for running the web scraper."""
-    args = parse_args()
+    Args:
+        parser (argparse.ArgumentParser, optional): Parser returned by parse_args.
+        args (argparse.Namespace, optional): Parsed arguments; parsed here if omitted.
+    """
+    if args is None:
+        parser, args = parse_args()
 
     # Handle utility flags before starting scrape
     if args.clean:
@@ -62,7 +77,9 @@ async def main():
         }
         os.makedirs('data', exist_ok=True)
         with open('data/temp_config.yaml', 'w') as f:
-            yaml.safe_dump(template_config, f, sort_keys=False)
+            # libyaml's C dumper when PyYAML was built with it, the pure-Python one otherwise.
+            dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+            yaml.dump(template_config, f, Dumper=dumper, sort_keys=False)
         logger.info("✅ Template temp_config.yaml created in /data directory.")
         return
 
@@ -83,10 +100,11 @@ async def main():
         # TODO: Implement reading URLs from batch file and orchestrate multi-URL scraping
         logger.warning("Batch mode is not yet implemented.")
     else:
-        parser = argparse.ArgumentParser()  # reuse parser to print usage
         parser.print_usage()
         logger.error("No target provided. Use --url or --batch to specify targets.")
 
 if __name__ == "__main__":
-    # Run the main function in the event loop
-    asyncio.run(main())
+    # Pick the event loop before starting it, then run the main function in it
+    parser, args = parse_args()
+    install_event_loop_policy(args.loop)
+    asyncio.run(main(parser, args))
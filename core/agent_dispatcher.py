@@ -1,17 +1,33 @@
 """Agent Dispatcher for One_Touch_Plus.
 
 Launches multiple asynchronous crawl agents, each with its own agent ID.
-Each agent is assigned a slice of the seed URL list.
+Seed URLs are assigned to agents by a stable hash of their domain, so all URLs of one domain
+share an agent (and its throttler) while each agent gets a mix of domains.
 """
 
 import asyncio
+import hashlib
 import uuid
 import logging
+from urllib.parse import urlsplit
 from core.scrape_orchestrator import start_scraping
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+async def _run_agent(config: dict, agent_targets: list[str], agent_id: str) -> str:
+    """Run one agent's crawl, logging (not raising) failures so other agents keep running."""
+    try:
+        await start_scraping(config, agent_targets, agent_id=agent_id)
+    except Exception:
+        logger.exception(f"[Agent {agent_id}] Crawl failed")
+    return agent_id
+
+def _agent_index(url: str, num_agents: int) -> int:
+    """Map a URL to an agent by a deterministic hash of its domain."""
+    digest = hashlib.blake2b(urlsplit(url).netloc.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_agents
+
 async def launch_agents(config: dict, targets: list[str], num_agents: int = 2):
     """
     Launch multiple crawl agents concurrently.
@@ -22,22 +38,24 @@ async def launch_agents(config: dict, targets: list[str], num_agents: int = 2):
         num_agents (int): Number of parallel crawl agents.
     """
     logger.info(f"🚀 Launching {num_agents} crawl agents...")
-    # Determine chunk size for splitting targets
-    chunk_size = max(1, len(targets) // num_agents)
+    # Stripe targets across agents by domain rather than by list position
+    buckets = [[] for _ in range(num_agents)]
+    for url in targets:
+        buckets[_agent_index(url, num_agents)].append(url)
     tasks = []
-    
-    for i in range(num_agents):
-        agent_id = str(uuid.uuid4())[:8]
-        # Each agent gets a slice of targets
-        agent_targets = targets[i * chunk_size : (i + 1) * chunk_size]
-        
-        if not agent_targets:
-            continue
-        
-        logger.info(f"[Agent {agent_id}] Assigned {len(agent_targets)} URLs")
-        task = asyncio.create_task(
-            start_scraping(config, agent_targets, agent_id=agent_id)
-        )
-        tasks.append(task)
-    
-    await asyncio.gather(*tasks)
+
+    # The TaskGroup cancels and awaits every agent if launch_agents itself is cancelled.
+    async with asyncio.TaskGroup() as tg:
+        for agent_targets in buckets:
+            agent_id = str(uuid.uuid4())[:8]
+
+            if not agent_targets:
+                continue
+
+            logger.info(f"[Agent {agent_id}] Assigned {len(agent_targets)} URLs")
+            tasks.append(tg.create_task(_run_agent(config, agent_targets, agent_id)))
+
+        # Handle each agent as soon as it finishes rather than waiting on the slowest one.
+        for done, finished in enumerate(asyncio.as_completed(tasks), start=1):
+            agent_id = await finished
+            logger.info(f"[Agent {agent_id}] Finished ({len(tasks) - done} agents still running)")
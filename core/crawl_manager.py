@@ -2,31 +2,93 @@
 
 This module manages per-domain crawl queues using a priority heap (via heapq)
 to schedule URLs based on a scoring function. It also tracks visited URLs to prevent duplicates.
+
+Domains are scheduled through a second heap keyed by (epoch, best score, domain), so picking
+the next URL is O(log D + log N) and domains are served round-robin rather than draining the
+first domain before touching the next. A caller may name a preferred domain to keep
+drawing from the same host for a short burst (e.g. while its rate limit allows), which keeps
+its connections, robots.txt entry and throttle bucket warm.
+
+Visited URLs are tracked by their canonical form (see modules.url_dedup) in a SeenFilter, a
+scalable Bloom filter that costs a few bytes per URL instead of keeping every URL string
+alive; pass exact_mode=True to use a plain set instead.
+
+Each heap entry carries the URL's urlsplit() result, computed once when the URL is added, so
+the throttler, robots check and link extractor can reuse it instead of re-parsing the URL.
 """
 
 import heapq
-from urllib.parse import urlparse
+import re
+from functools import lru_cache
+from urllib.parse import urlsplit
 from collections import defaultdict
 import logging
-from ml.scoring_engine import predict_url_score
+from ml.scoring_engine import BOOST_KEYWORDS, PENALTY_KEYWORDS, predict_url_score, predict_url_scores
+from modules.url_dedup import SeenFilter, canonicalize
+from utils.bloom_filter import ScalableBloomFilter
 
 logger = logging.getLogger(__name__)
 
+def _compile_keywords(keywords, engine_keywords):
+    """
+    Compile a keyword list into one alternation regex, or None if nothing is left of it.
+
+    Keywords containing one of the scoring engine's own keywords of the same kind (e.g.
+    "/docs" against "docs") are dropped: any path they match has already been adjusted by
+    the engine, and counting it again would double the adjustment.
+    """
+    keywords = [k.lower() for k in keywords if not any(e in k.lower() for e in engine_keywords)]
+    if not keywords:
+        return None
+    return re.compile("|".join(map(re.escape, keywords)))
+
 class CrawlManager:
-    def __init__(self, max_depth=3):
+    def __init__(self, max_depth=3, exact_mode=False, config: dict = None):
         """
-        Initialize the CrawlManager with per-domain queues and a visited set.
+        Initialize the CrawlManager with per-domain queues and a visited filter.
 
         Args:
             max_depth (int): The maximum crawl depth.
+            exact_mode (bool): Track visited URLs in an exact set instead of a Bloom filter.
+            config (dict, optional): Configuration whose 'priority' keywords adjust URL scores.
         """
-        self.queues = defaultdict(list)  # domain → priority heap [(score, url, depth)]
-        self.visited = set()
+        priority_cfg = (config or {}).get("priority", {})
+        self._boost_re = _compile_keywords(priority_cfg.get("boost_keywords", []), BOOST_KEYWORDS)
+        self._penalty_re = _compile_keywords(priority_cfg.get("penalty_keywords", []), PENALTY_KEYWORDS)
+        self.queues = defaultdict(list)  # domain → priority heap [(score, url, depth, split)]
+        if exact_mode:
+            self.visited = set()
+        else:
+            self.visited = SeenFilter(
+                initial_capacity=1_000_000,
+                error_rate=1e-7,
+                mode=ScalableBloomFilter.LARGE_SET_GROWTH,
+            )
         self.max_depth = max_depth
+        self._domain_heap = []  # [(epoch, best_score, domain)], may hold stale entries
+        self._domain_keys = {}  # domain → its live entry in _domain_heap
+        self._epoch = 0  # bumped on every pop so served domains rotate to the back
+
+    @staticmethod
+    @lru_cache(maxsize=1 << 16)
+    def _parse(url: str):
+        return urlsplit(url)
+
+    def _mark_visited(self, url: str, split) -> bool:
+        """Record a URL's canonical form as visited; return True if it already was."""
+        key = canonicalize(url, split)
+        visited = self.visited
+        if isinstance(visited, set):
+            if key in visited:
+                return True
+            visited.add(key)
+            return False
+        return visited.add_if_absent(key)
 
     def score_url(self, url: str, config: dict) -> float:
         """
-        Compute a priority score for a URL using the ML scoring engine.
+        Compute a priority score for a URL using the ML scoring engine, adjusted by the
+        configured priority keywords (precompiled when the manager was created).
 
         Args:
             url (str): The URL to score.
@@ -35,7 +97,32 @@ class CrawlManager:
         Returns:
             float: The predicted score.
         """
-        return predict_url_score(url)
+        return self._adjust_score(url, predict_url_score(url))
+
+    def score_urls(self, urls: list, config: dict) -> list:
+        """
+        Compute priority scores for a batch of URLs with one scoring-engine call.
+
+        Args:
+            urls (list): The URLs to score.
+            config (dict): Configuration dict (reserved for future use).
+
+        Returns:
+            list: The scores, in input order.
+        """
+        return [self._adjust_score(url, score) for url, score in zip(urls, predict_url_scores(urls))]
+
+    def _adjust_score(self, url: str, score: float) -> float:
+        """Apply the configured boost/penalty keywords to a base score, never going below 0."""
+        if self._boost_re or self._penalty_re:
+            path = self._parse(url).path.lower()
+            score = max(0, round(
+                score
+                - 0.2 * bool(self._boost_re and self._boost_re.search(path))
+                + 0.3 * bool(self._penalty_re and self._penalty_re.search(path)),
+                2,
+            ))
+        return score
 
     def add_url(self, url: str, depth: int, config: dict = None):
         """
@@ -45,25 +132,128 @@ class CrawlManager:
             url (str): The URL to enqueue.
             depth (int): Current crawl depth.
             config (dict, optional): Configuration dict for priority scoring.
+
+        Returns:
+            bool: True if the URL was enqueued, False if it was skipped.
         """
-        if url in self.visited or depth > self.max_depth:
+        split = self._parse(url)
+        if depth > self.max_depth or self._mark_visited(url, split):
             logger.debug(f"Skipping duplicate or out-of-depth URL: {url}")
-            return
-        domain = urlparse(url).netloc
+            return False
+        domain = split.netloc
         score = self.score_url(url, config or {})
-        heapq.heappush(self.queues[domain], (score, url, depth))
-        self.visited.add(url)
+        heapq.heappush(self.queues[domain], (score, url, depth, split))
+        self._schedule_domain(domain, score)
         logger.debug(f"Enqueued URL: {url} at depth {depth} under domain {domain} with score {score}")
+        return True
 
-    def get_next_url(self):
+    def add_urls(self, urls, depth: int, config: dict = None, splits=None) -> int:
+        """
+        Add a batch of URLs discovered at the same depth.
+
+        New URLs are grouped by domain and merged into each domain heap in one step, which
+        avoids a heappush (and the per-call overhead of add_url) for every link on a page.
+
+        Args:
+            urls (list): The URLs to enqueue; a list, since without splits it is read twice.
+            depth (int): Crawl depth shared by all the URLs.
+            config (dict, optional): Configuration dict for priority scoring.
+            splits (iterable, optional): urlsplit() results parallel to urls, if already known.
+
+        Returns:
+            int: The number of URLs actually enqueued.
+        """
+        if depth > self.max_depth:
+            logger.debug(f"Skipping out-of-depth URLs at depth {depth}")
+            return 0
+        mark_visited = self._mark_visited
+        if splits is None:
+            splits = map(self._parse, urls)
+        new_urls = []
+        new_splits = []
+        for url, split in zip(urls, splits):
+            if mark_visited(url, split):
+                continue
+            new_urls.append(url)
+            new_splits.append(split)
+
+        by_domain = defaultdict(list)
+        for url, split, score in zip(new_urls, new_splits, self.score_urls(new_urls, config or {})):
+            by_domain[split.netloc].append((score, url, depth, split))
+
+        added = 0
+        for domain, items in by_domain.items():
+            queue = self.queues[domain]
+            # Re-heapifying is O(n); only worth it when the batch is large relative to the heap.
+            if len(items) >= len(queue):
+                queue.extend(items)
+                heapq.heapify(queue)
+            else:
+                for item in items:
+                    heapq.heappush(queue, item)
+            self._schedule_domain(domain, queue[0][0])
+            added += len(items)
+        logger.debug(f"Enqueued {added} URLs at depth {depth} across {len(by_domain)} domains")
+        return added
+
+    def _schedule_domain(self, domain: str, score: float):
+        """
+        Make sure the domain heap holds an entry for the domain reflecting its best score.
+
+        A better score keeps the domain's current epoch, so it never jumps ahead of its turn.
+        The superseded entry stays in the heap and is skipped when popped.
+
+        Args:
+            domain (str): The domain that just received a URL.
+            score (float): The score of the URL just pushed.
+        """
+        key = self._domain_keys.get(domain)
+        if key is not None and score >= key[1]:
+            return
+        epoch = key[0] if key is not None else self._epoch
+        key = (epoch, score, domain)
+        self._domain_keys[domain] = key
+        heapq.heappush(self._domain_heap, key)
+
+    def get_next_url(self, preferred_domain: str = None):
         """
         Retrieve the next URL from the per-domain queues by rotating through domains.
 
+        Args:
+            preferred_domain (str, optional): Domain to draw from out of turn if it still
+                has queued URLs; its place in the rotation is unchanged.
+
         Returns:
-            tuple: (url, depth) if available; otherwise, None.
+            tuple: (url, depth, split) if available, where split is the URL's urlsplit()
+            result; otherwise, None.
         """
-        for domain in list(self.queues):
-            if self.queues[domain]:
-                _, url, depth = heapq.heappop(self.queues[domain])
-                return url, depth
+        key = self._domain_keys.get(preferred_domain)
+        if key is not None:
+            queue = self.queues[preferred_domain]
+            _, url, depth, split = heapq.heappop(queue)
+            if queue:
+                # Keep the domain's epoch; the old key becomes a stale heap entry.
+                key = (key[0], queue[0][0], preferred_domain)
+                self._domain_keys[preferred_domain] = key
+                heapq.heappush(self._domain_heap, key)
+            else:
+                del self._domain_keys[preferred_domain]
+                del self.queues[preferred_domain]
+            return url, depth, split
+        while self._domain_heap:
+            key = heapq.heappop(self._domain_heap)
+            domain = key[2]
+            if self._domain_keys.get(domain) != key:
+                continue  # Stale entry superseded by a better score.
+            queue = self.queues[domain]
+            _, url, depth, split = heapq.heappop(queue)
+            self._epoch += 1
+            if queue:
+                key = (self._epoch, queue[0][0], domain)
+                self._domain_keys[domain] = key
+                heapq.heappush(self._domain_heap, key)
+            else:
+                del self._domain_keys[domain]
+                del self.queues[domain]
+            return url, depth, split
         return None
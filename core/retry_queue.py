@@ -1,28 +1,111 @@
 """Retry Queue for One_Touch_Plus.
 
 This module implements a simple retry mechanism. Failed URLs are added to a retry queue,
-with each retry attempt delayed by an exponential backoff.
+with each retry attempt delayed by a capped exponential backoff with random jitter, so URLs
+that failed together do not all retry at the same moment.
+
+Pending retries sit in a heap keyed by the loop time at which they become ready. A single
+dispatcher coroutine sleeps until the soonest retry is due and then signals the crawl's work
+queue, so retries are picked up by the same workers as fresh URLs instead of in a separate
+phase after the main crawl.
 """
 
 import asyncio
+import heapq
 import logging
+import random
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
 class RetryQueue:
-    def __init__(self, max_retries=3, backoff=2):
-        self.queue = []
+    def __init__(self, max_retries=3, backoff=2, base=1.0, cap=30.0, jitter=0.5):
+        self._heap = []  # (ready_at, url, depth, attempt)
+        self._ready = deque()  # retries whose backoff has elapsed, awaiting a worker
+        self._wakeup = asyncio.Event()
         self.max_retries = max_retries
         self.backoff = backoff
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+
+    def delay_for(self, attempt):
+        """
+        Compute the wait before an attempt: base * backoff ** (attempt - 2), capped, ± jitter.
+
+        Args:
+            attempt (int): The attempt number the retry will be (2 for the first retry).
+
+        Returns:
+            float: The delay in seconds.
+        """
+        delay = min(self.cap, self.base * self.backoff ** max(attempt - 2, 0))
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def __len__(self):
+        return len(self._heap) + len(self._ready)
+
+    def add(self, url, depth, attempt=1, delay=None):
+        """
+        Schedule a retry after an exponential backoff.
+
+        Args:
+            url (str): The URL to retry.
+            depth (int): The URL's crawl depth.
+            attempt (int): The attempt number the retry will be.
+            delay (float, optional): Seconds to wait instead of the backoff for this attempt.
+
+        Returns:
+            bool: True if the retry was scheduled, False if max_retries is exhausted.
+        """
+        if attempt > self.max_retries:
+            return False
+        if delay is None:
+            delay = self.delay_for(attempt)
+        ready_at = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self._heap, (ready_at, url, depth, attempt))
+        self._wakeup.set()
+        logger.info(f"[Retry] Re-enqueued {url} (attempt {attempt})")
+        return True
+
+    def pop_ready(self):
+        """
+        Take the oldest retry whose backoff has elapsed.
+
+        Returns:
+            tuple: (url, depth, attempt) if one is ready; otherwise, None.
+        """
+        return self._ready.popleft() if self._ready else None
+
+    async def dispatch(self, queue: asyncio.Queue):
+        """
+        Move retries to the ready list as their backoff elapses, adding one work-queue entry each.
+
+        A URL handed to the retry queue keeps the work-queue unit of the attempt that failed:
+        the failing worker skips task_done(), and the dispatcher calls it once the retry's own
+        entry is queued. queue.join() therefore keeps waiting while retries are pending.
+
+        Runs until cancelled.
 
-    def add(self, url, depth, attempt=1):
-        if attempt <= self.max_retries:
-            self.queue.append((url, depth, attempt))
-            logger.info(f"[Retry] Re-enqueued {url} (attempt {attempt})")
-
-    async def next(self):
-        if not self.queue:
-            return None
-        url, depth, attempt = self.queue.pop(0)
-        await asyncio.sleep(self.backoff ** (attempt - 1))
-        return url, depth, attempt
+        Args:
+            queue (asyncio.Queue): The crawl's work queue.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - loop.time()
+            if delay > 0:
+                # Wake early if a sooner retry is added while sleeping.
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            _, url, depth, attempt = heapq.heappop(self._heap)
+            self._ready.append((url, depth, attempt))
+            queue.put_nowait(None)
+            queue.task_done()
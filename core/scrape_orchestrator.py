@@ -7,99 +7,264 @@ and integrates ML-powered anomaly detection.
 An optional agent_id parameter is used to tag output and log agent-specific activity.
 """
 
+import aiohttp
 import asyncio
 import logging
 import os
-import yaml
+from urllib.parse import urlsplit
 
 from core.crawl_manager import CrawlManager
 from core.throttle_controller import ThrottleController
 from core.retry_queue import RetryQueue
+from modules.config_manager import load_yaml_cached
 from modules.output_reporter import OutputReporter
-from modules.page_fetcher import fetch_page
+from modules.page_fetcher import fetch_page, make_session
 from modules.link_extractor import extract_links
-from modules.robots_checker import is_allowed_by_robots
+from modules.robots_cache import is_allowed
 from ml.scoring_engine import detect_scrape_anomalies
 from handlers import dynamic_content_utils, captcha_handler
 from handlers.captcha_strategy import handle_captcha
+from utils.retry_handler import UnrecoverableError
 from modules.dashboard import print_dashboard
+from utils.event_loop import install_event_loop_policy
+from utils.logging_setup import configure_logging
 
-logging.basicConfig(
+configure_logging(
     level=logging.INFO,
-    format="%(asctime)s:%(levelname)s:%(name)s:%(message)s",
+    fmt="%(asctime)s:%(levelname)s:%(name)s:%(message)s",
 )
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 CONCURRENT_TASKS = 5
 
+def _inspect_page(html: str, url: str, config: dict, split, want_links: bool) -> list:
+    """Handle any CAPTCHA on a fetched page, then return its links if they are wanted."""
+    handle_captcha(html, url, config)
+    if not want_links:
+        return []
+    return extract_links(html, base_url=url, config=config, base_split=split)
+
 async def process_url(
     url: str,
     depth: int,
     config: dict,
     crawl_mgr: CrawlManager,
-    semaphore: asyncio.Semaphore,
-    reporter: OutputReporter,
+    queue: asyncio.Queue,
+    throttler: ThrottleController,
+    report_q: asyncio.Queue,
     retry_mgr: RetryQueue,
     attempt: int = 1,
-    agent_id: str = None
+    agent_id: str = None,
+    max_depth: int = 3,
+    use_robots: bool = True,
+    include_html: bool = False,
+    split=None,
+    session: aiohttp.ClientSession = None
 ):
     """
     Process a single URL: applies throttling, fetches and processes content,
     detects anomalies, handles CAPTCHA, reports output, and enqueues new URLs.
-    On failure, routes the URL to the retry queue with exponential backoff.
+    On failure, routes the URL to the retry queue with exponential backoff, unless the
+    failure is an UnrecoverableError. Fetch outcomes feed the throttler's per-domain circuit
+    breaker; URLs of a paused domain are deferred until it reopens, and URLs of a dropped
+    domain are skipped.
 
     Args:
         url (str): URL to process.
         depth (int): Current crawl depth.
         config (dict): Scraper configuration.
         crawl_mgr (CrawlManager): Crawl manager instance.
-        semaphore (asyncio.Semaphore): Concurrency limiter.
-        reporter (OutputReporter): Output reporter instance.
+        queue (asyncio.Queue): Work queue notified of each newly enqueued URL.
+        throttler (ThrottleController): Per-domain throttler shared by all workers.
+        report_q (asyncio.Queue): Queue feeding the background report writer.
         retry_mgr (RetryQueue): Retry manager instance.
         attempt (int): Current attempt number.
         agent_id (str, optional): Unique agent ID.
+        max_depth (int): Deepest level whose pages still contribute new links.
+        use_robots (bool): Whether discovered links are checked against robots.txt.
+        include_html (bool): Whether reported records keep the page's raw HTML.
+        split (SplitResult, optional): The URL's urlsplit() result, reused by the throttler
+            and link extractor; computed here if not given.
+        session (aiohttp.ClientSession, optional): Shared HTTP session for fetching.
+
+    Returns:
+        bool: True if the URL was handed to the retry queue.
     """
+    if split is None:
+        split = urlsplit(url)
+    domain = split.netloc
+    health = throttler.health
+    if domain in health.dropped:
+        logger.warning(f"Skipping {url}: {domain} was dropped after repeated failures")
+        return False
+    if health.is_open(domain):
+        # Same attempt number: the URL itself has not failed, its domain is paused.
+        return retry_mgr.add(url, depth, attempt, delay=health.remaining(domain))
+
     # Per-domain throttling.
-    throttler = ThrottleController(config)
-    await throttler.throttle(url)
-    await asyncio.sleep(config.get("crawl", {}).get("request_delay", 1))
+    await throttler.throttle(url, domain=domain)
+
+    try:
+        scraped_data = await fetch_page(url, config, session=session)
+        ok = bool(scraped_data) and scraped_data.get("status", 200) < 400
+        health.record(domain, ok)
+        if not ok:
+            status = scraped_data.get("status", "request error")
+            logger.warning(f"Fetch failed for {url} (attempt {attempt}): {status}")
+            return retry_mgr.add(url, depth, attempt + 1)
+        html = scraped_data.get("html", "")
+        # scraped_data keeps fetch_page's text snippet: the expansion stub returns the page as is.
+        expanded_html = await dynamic_content_utils.expand_content(html, config)
+
+        # Detect anomalies.
+        anomalies = detect_scrape_anomalies(scraped_data)
+        if anomalies:
+            logger.warning(f"[Anomaly] {url} triggered: {anomalies}")
+            scraped_data["anomalies"] = anomalies
+
+        # Attach agent_id if provided.
+        if agent_id:
+            scraped_data["agent_id"] = agent_id
+
+        # CAPTCHA detection and link extraction both parse the page, which is CPU-bound; keep
+        # them off the event loop so other fetches progress. Pages at max_depth contribute no
+        # links, so they are only checked for CAPTCHAs.
+        new_links = await asyncio.to_thread(
+            _inspect_page, expanded_html, url, config, split, depth < max_depth
+        )
+        # From here on the record on its way to the reporter is the only holder of the page,
+        # so it is freed as soon as it is written rather than while robots checks are awaited.
+        # Unless reports keep the HTML, it is dropped now rather than held in the report queue.
+        if not include_html:
+            scraped_data.pop("html", None)
+        del html, expanded_html
+        await report_q.put(scraped_data)
+        del scraped_data
+
+        if depth < max_depth:
+            # Split each link once; the robots check and the crawl manager share the result.
+            new_splits = [urlsplit(new_url) for new_url in new_links]
+            if use_robots:
+                debug = logger.isEnabledFor(logging.DEBUG)
+                allowed_links = []
+                allowed_splits = []
+                for new_url, new_split in zip(new_links, new_splits):
+                    if not await is_allowed(new_url, session, split=new_split):
+                        if debug:
+                            logger.debug("[robots] Skipping disallowed URL: %s", new_url)
+                        continue
+                    allowed_links.append(new_url)
+                    allowed_splits.append(new_split)
+                new_links, new_splits = allowed_links, allowed_splits
+            added = crawl_mgr.add_urls(new_links, depth=depth + 1, config=config, splits=new_splits)
+            for _ in range(added):
+                queue.put_nowait(None)
+            logger.info(
+                "[Agent %s] Enqueued %d new URLs from %s at depth %d",
+                agent_id or "main", added, url, depth + 1,
+            )
+    except UnrecoverableError as e:
+        logger.warning(f"Not retrying {url}: {e}")
+    except Exception as e:
+        logger.error(f"Error processing {url} (attempt {attempt}): {e}")
+        return retry_mgr.add(url, depth, attempt + 1)
+    return False
 
-    async with semaphore:
+async def crawl_worker(
+    config: dict,
+    crawl_mgr: CrawlManager,
+    queue: asyncio.Queue,
+    throttler: ThrottleController,
+    report_q: asyncio.Queue,
+    retry_mgr: RetryQueue,
+    settings: dict,
+    agent_id: str = None,
+    session: aiohttp.ClientSession = None
+):
+    """
+    Process URLs for as long as the work queue has entries.
+
+    Each queue entry stands for one unit of work: a retry whose backoff has elapsed or a URL
+    waiting in the crawl manager. Ready retries are taken first; otherwise the worker pops
+    the highest-priority URL rather than the one that triggered the entry. While the domain
+    it just crawled still has rate-limit budget, the worker stays on that domain so its
+    connections stay warm, and otherwise moves on in round-robin order.
+
+    Args:
+        config (dict): Scraper configuration.
+        crawl_mgr (CrawlManager): Crawl manager instance.
+        queue (asyncio.Queue): Work queue with one entry per pending unit of work.
+        throttler (ThrottleController): Per-domain throttler shared by all workers.
+        report_q (asyncio.Queue): Queue feeding the background report writer.
+        retry_mgr (RetryQueue): Retry manager instance.
+        settings (dict): Per-URL settings resolved once by start_scraping.
+        agent_id (str, optional): Unique agent ID.
+        session (aiohttp.ClientSession, optional): Shared HTTP session for fetching.
+    """
+    last_domain = None
+    while True:
+        await queue.get()
+        deferred = False
         try:
-            scraped_data = await fetch_page(url, config)
-            html = scraped_data.get("html", "")
-            expanded_html = await dynamic_content_utils.expand_content(html, config)
-            scraped_data["snippet"] = expanded_html[:300]
-
-            # Handle CAPTCHA.
-            handle_captcha(expanded_html, url, config)
-
-            # Detect anomalies.
-            anomalies = detect_scrape_anomalies(scraped_data)
-            if anomalies:
-                logger.warning(f"[Anomaly] {url} triggered: {anomalies}")
-                scraped_data["anomalies"] = anomalies
-
-            # Attach agent_id if provided.
-            if agent_id:
-                scraped_data["agent_id"] = agent_id
-
-            reporter.generate_report(scraped_data)
-
-            new_links = extract_links(expanded_html, base_url=url, config=config)
-            max_depth = config.get("scraper", {}).get("max_depth", 3)
-            if depth < max_depth:
-                for new_url in new_links:
-                    if config.get("crawl", {}).get("use_robots", True):
-                        if not is_allowed_by_robots(new_url):
-                            logger.info(f"[robots] Skipping disallowed URL: {new_url}")
-                            continue
-                    crawl_mgr.add_url(new_url, depth=depth + 1, config=config)
-                    logger.info(f"[Agent {agent_id or 'main'}] Added new URL: {new_url} at depth {depth + 1}")
-        except Exception as e:
-            logger.error(f"Error processing {url} (attempt {attempt}): {e}")
-            retry_mgr.add(url, depth, attempt + 1)
+            retry_item = retry_mgr.pop_ready()
+            if retry_item:
+                url, depth, attempt = retry_item
+                split = None
+                logger.info(
+                    f"Agent {agent_id or 'main'} retrying URL: {url} at depth {depth}, attempt {attempt}"
+                )
+            else:
+                if last_domain is not None and not throttler.has_budget(last_domain):
+                    last_domain = None
+                result = crawl_mgr.get_next_url(preferred_domain=last_domain)
+                if not result:
+                    continue
+                url, depth, split = result
+                last_domain = split.netloc
+                attempt = 1
+                logger.info(f"Agent {agent_id or 'main'} scheduling URL: {url} at depth {depth}")
+            deferred = await process_url(
+                url, depth, config, crawl_mgr, queue, throttler, report_q, retry_mgr, attempt,
+                agent_id=agent_id, split=split, session=session, **settings,
+            )
+        finally:
+            # A deferred URL's unit is released by the retry dispatcher instead.
+            if not deferred:
+                queue.task_done()
+
+async def report_worker(report_q: asyncio.Queue, reporter: OutputReporter, flush_interval: float = 1.0,
+                        max_batch: int = 256):
+    """
+    Hand scraped records to the reporter off the event loop until a None sentinel arrives.
+
+    Records already waiting in the queue are taken together, up to max_batch at a time, and
+    written in one worker-thread hop, so a burst of pages costs one thread handoff rather than
+    one per record. When no record arrives for flush_interval seconds, the reporter's buffered
+    rows are flushed so a slow crawl still shows up in the database promptly.
+
+    Args:
+        report_q (asyncio.Queue): Queue of scraped data dicts, terminated by None.
+        reporter (OutputReporter): Output reporter instance.
+        flush_interval (float): Idle time in seconds after which buffered rows are flushed.
+        max_batch (int): Most records handed to the reporter in one thread hop.
+    """
+    while True:
+        try:
+            item = await asyncio.wait_for(report_q.get(), timeout=flush_interval)
+        except asyncio.TimeoutError:
+            await asyncio.to_thread(reporter.flush)
+            continue
+        batch = []
+        while item is not None:
+            batch.append(item)
+            if len(batch) >= max_batch or report_q.empty():
+                break
+            item = report_q.get_nowait()
+        if batch:
+            await asyncio.to_thread(reporter.generate_reports, batch)
+        if item is None:
+            break
 
 async def start_scraping(config: dict, targets, agent_id: str = None):
     """
@@ -111,7 +276,7 @@ async def start_scraping(config: dict, targets, agent_id: str = None):
         agent_id (str, optional): Unique ID for the agent.
     """
     max_depth = config.get('scraper', {}).get('max_depth', 3)
-    crawl_mgr = CrawlManager(max_depth=max_depth)
+    crawl_mgr = CrawlManager(max_depth=max_depth, config=config)
     retry_mgr = RetryQueue(max_retries=config.get("crawl", {}).get("max_retries", 3))
 
     if isinstance(targets, str):
@@ -120,40 +285,48 @@ async def start_scraping(config: dict, targets, agent_id: str = None):
         logger.error("No valid target URLs provided.")
         return
 
+    queue = asyncio.Queue()
     for url in targets:
-        crawl_mgr.add_url(url, depth=0, config=config)
+        if crawl_mgr.add_url(url, depth=0, config=config):
+            queue.put_nowait(None)
     logger.info(f"🤖 Agent {agent_id or 'main'} initialized with crawl queue: {crawl_mgr.queues}")
 
     reporter = OutputReporter(config)
-    semaphore = asyncio.Semaphore(CONCURRENT_TASKS)
-    tasks = []
+    report_q = asyncio.Queue(maxsize=1000)
+    throttler = ThrottleController(config)
+    # Resolve per-URL config values once instead of on every process_url call.
+    settings = {
+        "max_depth": max_depth,
+        "use_robots": config.get("crawl", {}).get("use_robots", True),
+        "include_html": config.get("include_html", False),
+    }
 
-    while True:
-        result = crawl_mgr.get_next_url()
-        if not result:
-            break
-        url, depth = result
-        logger.info(f"Agent {agent_id or 'main'} scheduling URL: {url} at depth {depth}")
-        task = asyncio.create_task(
-            process_url(url, depth, config, crawl_mgr, semaphore, reporter, retry_mgr, agent_id=agent_id)
-        )
-        tasks.append(task)
+    # One pooled session for the whole crawl, so connections are reused across URLs.
+    async with make_session(config, max_connections=CONCURRENT_TASKS * 4) as session:
+        async with asyncio.TaskGroup() as tg:
+            # Reporter I/O runs in its own task so fetchers never block on file or DB writes.
+            tg.create_task(report_worker(report_q, reporter))
+            # Persistent workers pick up newly discovered URLs while earlier pages are still fetching;
+            # the worker count is the crawl's concurrency limit.
+            workers = [
+                tg.create_task(
+                    crawl_worker(
+                        config, crawl_mgr, queue, throttler, report_q, retry_mgr, settings,
+                        agent_id=agent_id, session=session,
+                    )
+                )
+                for _ in range(CONCURRENT_TASKS)
+            ]
 
-    if tasks:
-        await asyncio.gather(*tasks)
+            # Retries are released into the same work queue as their backoff elapses.
+            dispatcher = tg.create_task(retry_mgr.dispatch(queue))
 
-    while True:
-        retry_item = await retry_mgr.next()
-        if not retry_item:
-            break
-        url, depth, attempt = retry_item
-        logger.info(f"Agent {agent_id or 'main'} retrying URL: {url} at depth {depth}, attempt {attempt}")
-        task = asyncio.create_task(
-            process_url(url, depth, config, crawl_mgr, semaphore, reporter, retry_mgr, attempt, agent_id=agent_id)
-        )
-        tasks.append(task)
-    if tasks:
-        await asyncio.gather(*tasks)
+            await queue.join()
+
+            dispatcher.cancel()
+            for w in workers:
+                w.cancel()
+            await report_q.put(None)
 
     reporter.finalize()
     logger.info(f"✅ Agent {agent_id or 'main'} completed crawling.")
@@ -164,11 +337,11 @@ async def start_scraping(config: dict, targets, agent_id: str = None):
 if __name__ == "__main__":
     print("Starting One_Touch_Plus scraper...")
     config_path = os.path.join("configs", "async_config.yaml")
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_cached(config_path)
     start_urls = [
         "https://www.python.org",
         "https://docs.python.org/3/",
         "https://example.com"
     ]
+    install_event_loop_policy()
     asyncio.run(start_scraping(config, start_urls))
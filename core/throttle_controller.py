@@ -1,30 +1,169 @@
 """Throttle Controller for One_Touch_Plus.
 
-This module implements per-domain rate limiting by tracking the last request timestamp
-for each domain and delaying the next request until the configured delay has passed.
+This module implements per-domain rate limiting with token buckets. Each domain's bucket
+refills at `crawl.rps` tokens per second up to `crawl.burst` tokens; a request takes one
+token, waiting for the bucket to refill when it is empty. Without `rps` configured the rate
+falls back to one request per `crawl.request_delay` seconds with a burst of one, which spaces
+requests exactly as a fixed per-domain delay would.
+
+A bucket is stored as a single integer per domain: its theoretical arrival time, i.e. the
+time.monotonic_ns() at which the bucket would be empty again (the GCRA form of a token
+bucket). A request reserves its slot by advancing that time before sleeping, with no await in
+between, so concurrent requests to one domain queue up behind each other without a lock while
+other domains proceed. A single instance is meant to be shared by every worker of a crawl so
+the buckets persist. Buckets are kept for the most recently used domains only (an LRU of
+`max_domains`), so broad crawls don't grow the table without bound; a domain evicted and seen
+again simply starts with a full bucket.
+
+The controller also carries a DomainHealth circuit breaker, which pauses a domain that starts
+failing instead of letting every worker keep retrying into a ban. Its thresholds come from the
+`crawl.health_*` settings (window, max_failure_rate, min_samples, drop_streak, cooldown and
+max_cooldown).
 """
 
 import asyncio
 import time
-from urllib.parse import urlparse
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _domain_of(url: str) -> str:
+    # "scheme://netloc/rest" splits into [scheme:, "", netloc, rest]; anything unusual
+    # (query or fragment right after the host, other schemes) goes through urlsplit.
+    parts = url.split("/", 3)
+    if len(parts) > 2 and parts[0] in ("http:", "https:") and not parts[1]:
+        netloc = parts[2]
+        if "?" not in netloc and "#" not in netloc:
+            return netloc
+    return urlsplit(url).netloc
+
+class DomainHealth:
+    """Per-domain circuit breaker driven by the outcomes of recent requests."""
+    def __init__(self, window: int = 100, max_failure_rate: float = 0.1, min_samples: int = 10,
+                 drop_streak: int = 50, base_cooldown: float = 60, max_cooldown: float = 30 * 60):
+        """
+        Initialize the breaker.
+
+        Args:
+            window (int): Number of recent outcomes kept per domain.
+            max_failure_rate (float): Failure share of the window above which the breaker opens.
+            min_samples (int): Outcomes needed in the window before the rate is judged.
+            drop_streak (int): Consecutive failures after which the domain is given up on.
+            base_cooldown (float): Seconds the breaker stays open the first time it trips.
+            max_cooldown (float): Upper bound on the cool-down, which doubles on each trip.
+        """
+        self.window = window
+        self.max_failure_rate = max_failure_rate
+        self.min_samples = min_samples
+        self.drop_streak = drop_streak
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self._outcomes = {}  # domain → deque of recent bools (True = ok)
+        self._streaks = {}  # domain → consecutive failures
+        self._trips = {}  # domain → times tripped without an intervening success
+        self._opened_until = {}  # domain → time.monotonic() at which the breaker closes
+        self.dropped = set()
+
+    def is_open(self, domain: str) -> bool:
+        """Return True if requests to the domain are currently paused."""
+        return self._opened_until.get(domain, 0) > time.monotonic()
+
+    def remaining(self, domain: str) -> float:
+        """Return the seconds until the domain's breaker closes (0 if it is closed)."""
+        return max(0.0, self._opened_until.get(domain, 0) - time.monotonic())
+
+    def record(self, domain: str, ok: bool):
+        """
+        Record a request outcome, opening the breaker or dropping the domain if warranted.
+
+        Args:
+            domain (str): The domain (netloc) the request went to.
+            ok (bool): Whether the request succeeded.
+        """
+        outcomes = self._outcomes.get(domain)
+        if outcomes is None:
+            outcomes = self._outcomes[domain] = deque(maxlen=self.window)
+        outcomes.append(ok)
+        if ok:
+            self._streaks[domain] = 0
+            self._trips[domain] = 0
+            return
+        streak = self._streaks[domain] = self._streaks.get(domain, 0) + 1
+        if streak >= self.drop_streak:
+            if domain not in self.dropped:
+                logger.warning(f"[Health] Dropping {domain} after {streak} consecutive failures")
+                self.dropped.add(domain)
+            return
+        failures = outcomes.count(False)
+        if len(outcomes) >= self.min_samples and failures > self.max_failure_rate * len(outcomes):
+            trips = self._trips.get(domain, 0)
+            cooldown = min(self.max_cooldown, self.base_cooldown * 2 ** trips)
+            self._trips[domain] = trips + 1
+            self._opened_until[domain] = time.monotonic() + cooldown
+            logger.warning(
+                f"[Health] Pausing {domain} for {cooldown:.0f}s "
+                f"({failures}/{len(outcomes)} recent requests failed)"
+            )
+            outcomes.clear()  # Judge the domain afresh once the breaker closes.
+
 class ThrottleController:
-    def __init__(self, config: dict):
-        self.domain_timestamps = {}
-        self.delay = config.get("crawl", {}).get("request_delay", 1)
-
-    async def throttle(self, url: str):
-        domain = urlparse(url).netloc
-        now = time.time()
-        last_time = self.domain_timestamps.get(domain, 0)
-        elapsed = now - last_time
-
-        if elapsed < self.delay:
-            sleep_time = self.delay - elapsed
-            logger.debug(f"[Throttle] Sleeping {sleep_time:.2f}s for domain: {domain}")
-            await asyncio.sleep(sleep_time)
-
-        self.domain_timestamps[domain] = time.time()
+    def __init__(self, config: dict, max_domains: int = 100_000):
+        crawl_cfg = config.get("crawl", {})
+        delay = crawl_cfg.get("request_delay", 1)
+        self.rate = crawl_cfg.get("rps") or (1 / delay if delay > 0 else None)  # None: unthrottled
+        self.capacity = crawl_cfg.get("burst", 1)
+        if self.rate:
+            self.interval_ns = int(1e9 / self.rate)
+            # How far ahead of now a domain's arrival time may run before requests must wait.
+            self.tolerance_ns = int((self.capacity - 1) * self.interval_ns)
+        self._tat = OrderedDict()  # domain → theoretical arrival time, in time.monotonic_ns(); LRU order
+        self.max_domains = max_domains
+        self.health = DomainHealth(
+            window=crawl_cfg.get("health_window", 100),
+            max_failure_rate=crawl_cfg.get("health_max_failure_rate", 0.1),
+            min_samples=crawl_cfg.get("health_min_samples", 10),
+            drop_streak=crawl_cfg.get("health_drop_streak", 50),
+            base_cooldown=crawl_cfg.get("health_cooldown", 60),
+            max_cooldown=crawl_cfg.get("health_max_cooldown", 30 * 60),
+        )
+
+    def has_budget(self, domain: str) -> bool:
+        """
+        Check, without taking a token, whether a request to the domain would go out immediately.
+
+        Args:
+            domain (str): The domain (netloc) to check.
+
+        Returns:
+            bool: True if the domain's bucket holds at least one token.
+        """
+        if not self.rate:
+            return True
+        return self._tat.get(domain, 0) - self.tolerance_ns <= time.monotonic_ns()
+
+    async def throttle(self, url: str, domain: str = None):
+        """
+        Wait until the URL's domain has a token available, then take it.
+
+        Args:
+            url (str): The URL about to be fetched.
+            domain (str, optional): The URL's netloc, if the caller has already parsed it.
+        """
+        if not self.rate:
+            return
+        if domain is None:
+            domain = _domain_of(url)
+        now = time.monotonic_ns()
+        tats = self._tat
+        tat = tats.get(domain, now)
+        # max() keeps the schedule when many requests are already queued on the domain.
+        tats[domain] = max(tat, now) + self.interval_ns
+        tats.move_to_end(domain)
+        if len(tats) > self.max_domains:
+            tats.popitem(last=False)
+        wait = tat - self.tolerance_ns - now
+        if wait > 0:
+            logger.debug("[Throttle] Sleeping %.2fs for domain: %s", wait / 1e9, domain)
+            await asyncio.sleep(wait / 1e9)
@@ -1,47 +1,118 @@
-import sqlite3
 import pandas as pd
 import streamlit as st
 from datetime import datetime
-from urllib.parse import urlparse
+
+from modules.dashboard import open_reader
 
 DB_PATH = "data/crawler.db"
+PAGE_SIZE = 1000
 
 st.set_page_config(page_title="🧠 One_Touch_Plus Dashboard", layout="wide")
 st.title("🧠 One_Touch_Plus Crawl Dashboard")
 st.markdown("A real-time view into your crawl performance and data volume.")
 
+def connect(db_path):
+    """Open the crawl DB read-only for dashboard reads; the schema is the writer's to change."""
+    conn = open_reader(db_path)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-64000")
+    return conn
+
 @st.cache_data(ttl=60)
-def load_data(db_path):
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql_query("SELECT * FROM scraped_data", conn)
+def load_summary(db_path):
+    conn = connect(db_path)
+    total, unique_domains, min_ts, max_ts = conn.execute(
+        "SELECT COUNT(*), COUNT(DISTINCT domain), MIN(ts_epoch), MAX(ts_epoch) FROM scraped_data"
+    ).fetchone()
+    domains = [row[0] for row in conn.execute(
+        "SELECT DISTINCT domain FROM scraped_data WHERE domain IS NOT NULL ORDER BY domain"
+    )]
     conn.close()
-    return df
+    return total, unique_domains, min_ts, max_ts, domains
+
+def _where(domains, t0, t1, kw=""):
+    """
+    Build the WHERE clause for the sidebar filters.
+
+    Args:
+        domains (tuple): Domains to include, or None for all.
+        t0 (int): Earliest write time, in epoch seconds.
+        t1 (int): Latest write time, in epoch seconds.
+        kw (str): Case-insensitive substring the URL must contain.
+
+    Returns:
+        tuple: (clause, params).
+    """
+    clause = "WHERE ts_epoch BETWEEN ? AND ?"
+    params = [t0, t1]
+    if kw:
+        # Escape LIKE's wildcards so '%' and '_' in the search text match literally.
+        clause += " AND url LIKE ? ESCAPE '\\'"
+        escaped = kw.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params.append(f"%{escaped}%")
+    if domains is not None:
+        clause += f" AND domain IN ({','.join('?' * len(domains))})"
+        params.extend(domains)
+    return clause, params
+
+@st.cache_data(ttl=60)
+def load_counts(db_path, domains, t0, t1):
+    """Per-domain and per-minute record counts for the charts, aggregated by SQLite."""
+    where, params = _where(domains, t0, t1)
+    conn = connect(db_path)
+    domain_counts = pd.read_sql_query(
+        f"SELECT COALESCE(domain, 'unknown') AS domain, COUNT(*) AS records FROM scraped_data {where} "
+        "GROUP BY 1 ORDER BY 2 DESC",
+        conn, params=params, index_col="domain",
+    )["records"]
+    timeline = pd.read_sql_query(
+        f"SELECT ts_epoch / 60 * 60 AS minute, COUNT(*) AS records FROM scraped_data {where} "
+        "GROUP BY 1 ORDER BY 1",
+        conn, params=params,
+    )
+    conn.close()
+    timeline.index = pd.to_datetime(timeline["minute"], unit="s")
+    return domain_counts, timeline["records"]
 
-def extract_domain(url):
-    try:
-        return urlparse(url).netloc
-    except:
-        return "unknown"
+@st.cache_data(ttl=60)
+def load_filtered(db_path, domains, t0, t1, kw="", limit=None, offset=0):
+    """
+    Load only the rows matching the sidebar filters, newest first; SQLite does the filtering.
+
+    Args:
+        db_path (str): Path to the crawl DB.
+        domains (tuple): Domains to include, or None for all.
+        t0 (int): Earliest write time, in epoch seconds.
+        t1 (int): Latest write time, in epoch seconds.
+        kw (str): Case-insensitive substring the URL must contain.
+        limit (int, optional): Maximum number of rows to return.
+        offset (int): Number of matching rows to skip.
+    """
+    where, params = _where(domains, t0, t1, kw)
+    query = f"SELECT url, title, ts_epoch, domain FROM scraped_data {where} ORDER BY ts_epoch DESC"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params += [limit, offset]
+    conn = connect(db_path)
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    df["timestamp_dt"] = pd.to_datetime(df["ts_epoch"], unit="s")
+    df["domain"] = df["domain"].fillna("unknown")
+    return df
 
 # Load crawl data
 try:
-    df = load_data(DB_PATH)
-
-    # Convert and add datetime column, converting to native datetime
-    df["timestamp_dt"] = pd.to_datetime(df["timestamp"], format="%Y%m%d_%H%M%S", errors="coerce")
-    # Convert pandas Timestamp to native datetime objects if needed
-    df["timestamp_dt"] = df["timestamp_dt"].apply(lambda ts: ts.to_pydatetime() if pd.notnull(ts) else None)
-    
-    df["domain"] = df["url"].apply(extract_domain)
+    total, unique_domains, min_ts, max_ts, all_domains = load_summary(DB_PATH)
 
     # Summary Metrics
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Records", len(df))
-    col2.metric("Unique Domains", df["domain"].nunique())
+    col1.metric("Total Records", total)
+    col2.metric("Unique Domains", unique_domains)
 
-    latest_ts = df["timestamp_dt"].max()
-    if latest_ts:
-        latest_str = latest_ts.strftime("%B %d, %Y – %I:%M %p")
+    min_time = pd.to_datetime(min_ts, unit="s")
+    max_time = pd.to_datetime(max_ts, unit="s")
+    if pd.notnull(max_time):
+        latest_str = max_time.strftime("%B %d, %Y – %I:%M %p")
     else:
         latest_str = "N/A"
     col3.metric("Latest Crawl", latest_str)
@@ -50,17 +121,13 @@ try:
     st.sidebar.header("🔎 Filters")
 
     # Domain filter
-    unique_domains = sorted(df["domain"].dropna().unique())
-    selected_domains = st.sidebar.multiselect("Filter by Domain", unique_domains, default=unique_domains)
-
-    # Time filter: convert min and max to native datetime objects.
-    min_time = df["timestamp_dt"].min()
-    max_time = df["timestamp_dt"].max()
-    if min_time and max_time:
-        min_time = min_time.to_pydatetime() if hasattr(min_time, "to_pydatetime") else min_time
-        max_time = max_time.to_pydatetime() if hasattr(max_time, "to_pydatetime") else max_time
-    else:
-        min_time, max_time = datetime.now(), datetime.now()
+    selected_domains = st.sidebar.multiselect("Filter by Domain", all_domains, default=all_domains)
+    # Selecting every domain is the same as not filtering by domain.
+    domains = None if len(selected_domains) == len(all_domains) else tuple(selected_domains)
+
+    # Time filter
+    if pd.isnull(min_time) or pd.isnull(max_time):
+        min_time, max_time = datetime.utcnow(), datetime.utcnow()
 
     time_range = st.sidebar.slider(
         "Filter by Time Range",
@@ -69,42 +136,40 @@ try:
         value=(min_time, max_time),
         format="MM/DD/YY – %H:%M"
     )
-
-    # Filter dataset
-    filtered_df = df[
-        df["domain"].isin(selected_domains) &
-        df["timestamp_dt"].between(time_range[0], time_range[1])
-    ]
+    # The slider works in naive UTC datetimes, matching pd.to_datetime(..., unit="s").
+    t0, t1 = (int(pd.Timestamp(t).timestamp()) for t in time_range)
 
     # Charts
+    domain_counts, timeline = load_counts(DB_PATH, domains, t0, t1)
     st.subheader("📊 Records per Domain")
-    domain_counts = filtered_df["domain"].value_counts()
     st.bar_chart(domain_counts)
 
     st.subheader("📈 Crawl Timeline")
-    timeline = filtered_df.groupby(filtered_df["timestamp_dt"].dt.floor("min")).size()
     st.line_chart(timeline)
 
     # Search + Raw Data
     st.subheader("🔍 Search URLs")
     search_term = st.text_input("Enter keyword to filter URLs:")
-    if search_term:
-        filtered_df = filtered_df[filtered_df["url"].str.contains(search_term, case=False, na=False)]
 
     st.subheader("📄 Raw Records")
+    page = st.number_input("Page", min_value=1, value=1, step=1)
+    page_df = load_filtered(
+        DB_PATH, domains, t0, t1, search_term, limit=PAGE_SIZE, offset=(page - 1) * PAGE_SIZE
+    )
     st.dataframe(
-        filtered_df[["url", "title", "timestamp_dt", "domain"]].sort_values("timestamp_dt", ascending=False),
+        page_df[["url", "title", "timestamp_dt", "domain"]],
         use_container_width=True
     )
 
-    # Export Button
-    csv_export = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="📥 Download filtered results as CSV",
-        data=csv_export,
-        file_name="filtered_crawl_data.csv",
-        mime="text/csv"
-    )
+    # Export Button: the full filtered result is only loaded when an export is requested.
+    if st.button("Prepare CSV export of filtered results"):
+        csv_export = load_filtered(DB_PATH, domains, t0, t1, search_term).to_csv(index=False)
+        st.download_button(
+            label="📥 Download filtered results as CSV",
+            data=csv_export,
+            file_name="filtered_crawl_data.csv",
+            mime="text/csv"
+        )
 
 except Exception as e:
     st.error(f"⚠️ Failed to load dashboard: {e}")
@@ -1,29 +1,54 @@
 """CAPTCHA fallback diagnostic utility for One_Touch_Plus.
 
-Saves HTML snapshots of suspected CAPTCHA pages for review.
+Saves HTML snapshots of suspected CAPTCHA pages for review. Snapshots are written to a
+temporary file and renamed into place, so a crash mid-write never leaves a partial snapshot.
 """
 
+import functools
+import hashlib
 import os
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-def handle_captcha_failure(html: str, url: str, config: dict):
+@functools.cache
+def _ensure_dir(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def handle_captcha_failure(html, url: str, config: dict):
+    """
+    Save a snapshot of a suspected CAPTCHA page, if the fallback is enabled.
+
+    Args:
+        html (bytes or str): The page content; str is encoded to UTF-8.
+        url (str): The page URL, hashed into the snapshot filename.
+        config (dict): Scraper configuration with 'captcha' options.
+    """
     if not config.get("captcha", {}).get("fallback_enabled", False):
         logger.debug("[CAPTCHA] Fallback not enabled.")
         return
 
-    output_dir = config.get("captcha", {}).get("snapshot_dir", "data/captcha_logs")
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = _ensure_dir(config.get("captcha", {}).get("snapshot_dir", "data/captcha_logs"))
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    safe_url = url.replace("https://", "").replace("http://", "").replace("/", "_")
-    filename = f"{timestamp}_{safe_url}.html"
-    path = os.path.join(output_dir, filename)
+    # A fixed-length hash keeps long URLs under the filesystem's name limit.
+    url_hash = hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
+    path = os.path.join(output_dir, f"{timestamp}_{url_hash}.html")
+    tmp = path + ".part"
+    if isinstance(html, str):
+        html = html.encode("utf-8")
 
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(html)
-        logger.info(f"[CAPTCHA] Saved fallback HTML snapshot: {path}")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            view = memoryview(html)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+        logger.info(f"[CAPTCHA] Saved fallback HTML snapshot: {path} ({url})")
     except Exception as e:
         logger.error(f"[CAPTCHA] Failed to save snapshot: {e}")
@@ -4,15 +4,97 @@ This module provides a stub for detecting CAPTCHA challenges.
 If potential CAPTCHA indicators are found in the provided content,
 it saves a snapshot of the HTML for review. This function is designed
 to be swapped out later for a real CAPTCHA solver or manual intervention.
+
+Detection looks at what a page embeds rather than at its body text: the src of its scripts,
+iframes and images, its form actions and its form field names. A resource matches when it
+is served by a known provider host (one set lookup), or when its path or name carries a
+challenge indicator such as "captcha" or "cdn-cgi/challenge-platform", which also catches
+relative resources of self-hosted CAPTCHAs and Cloudflare's own challenge pages. Words like
+"captcha" in ordinary page copy no longer cause false positives. Resources are collected
+with selectolax when it is installed, falling back to lxml.
 """
 
 import os
+import re
 import logging
 import asyncio
 from datetime import datetime
+from urllib.parse import urlsplit
+
+import lxml.html
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Not installed, or too old to have the lexbor backend
+    HTMLParser = None
 
 logger = logging.getLogger(__name__)
 
+# Hosts (and host/first-path-segment keys) that serve CAPTCHA or bot-challenge widgets.
+# A host also matches its subdomains, e.g. js.hcaptcha.com.
+CAPTCHA_HOSTS = frozenset({
+    "www.google.com/recaptcha",
+    "www.gstatic.com/recaptcha",
+    "recaptcha.net",
+    "hcaptcha.com",
+    "challenges.cloudflare.com",
+    "arkoselabs.com",
+    "funcaptcha.com",
+    "captcha-delivery.com",
+    "geetest.com",
+})
+
+# Path and bundle-name indicators, matched anywhere in a resource, relative or not.
+_CAPTCHA_INDICATORS_RE = re.compile(
+    r"captcha|turnstile|cf-challenge|cdn-cgi/challenge-platform", re.IGNORECASE
+)
+
+def _embedded_resources(html: str) -> list:
+    """Return the src of every script, iframe and image, form actions and form field names."""
+    if not html or not html.strip():
+        return []
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        resources = [n.attributes.get("src") for n in tree.css("script[src], iframe[src], img[src]")]
+        resources += [n.attributes.get("action") for n in tree.css("form[action]")]
+        resources += [n.attributes.get("name") for n in tree.css("input[name]")]
+        return [r for r in resources if r]
+    try:
+        return lxml.html.fromstring(html).xpath(
+            "//script/@src | //iframe/@src | //img/@src | //form/@action | //input/@name"
+        )
+    except lxml.etree.ParserError:  # e.g. a document holding only comments
+        return []
+
+def _is_captcha_resource(url: str) -> bool:
+    if _CAPTCHA_INDICATORS_RE.search(url):
+        return True
+    try:
+        parts = urlsplit(url.strip())
+        host = parts.hostname
+    except ValueError:  # Malformed src, e.g. unbalanced IPv6 brackets; not a provider URL.
+        return False
+    if not host:
+        return False  # A relative URL without an indicator; provider widgets are never relative.
+    segment = parts.path.split("/", 2)[1] if parts.path.startswith("/") else ""
+    if f"{host}/{segment}" in CAPTCHA_HOSTS:
+        return True
+    labels = host.split(".")
+    return any(".".join(labels[i:]) in CAPTCHA_HOSTS for i in range(len(labels) - 1))
+
+def detect_captcha(content: str) -> bool:
+    """
+    Check whether HTML content embeds a CAPTCHA or bot-challenge widget.
+
+    Args:
+        content (str): The HTML content.
+
+    Returns:
+        bool: True if an embedded resource points at a known CAPTCHA provider or carries a
+        challenge indicator.
+    """
+    return any(_is_captcha_resource(url) for url in _embedded_resources(content))
+
 async def handle_captcha(content: str, config: dict):
     """
     Detect and handle CAPTCHA challenges.
@@ -27,8 +109,7 @@ async def handle_captcha(content: str, config: dict):
     Returns:
         None
     """
-    # Simple heuristic: if "captcha" appears in the content (case-insensitive)
-    if "captcha" in content.lower():
+    if detect_captcha(content):
         logger.info("Potential CAPTCHA detected in content.")
         if config.get("captcha", {}).get("save_snapshot", True):
             output_dir = config.get("output_dir", "data")
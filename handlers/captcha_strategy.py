@@ -2,10 +2,12 @@
 
 This module defines handle_captcha, which routes CAPTCHA handling based on the configured mode.
 Options include 'none', 'fallback', and 'solver' (for future integration).
+Pages without CAPTCHA indicators are passed over before any mode is applied.
 """
 
 import logging
 from handlers import captcha_fallback
+from handlers.captcha_handler import detect_captcha
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +16,8 @@ def handle_captcha(html: str, url: str, config: dict):
 
     if mode == "none":
         logger.debug("[CAPTCHA] Mode: none — skipping CAPTCHA handling.")
+    elif not detect_captcha(html):
+        logger.debug(f"[CAPTCHA] No CAPTCHA detected on {url}.")
     elif mode == "fallback":
         logger.info("[CAPTCHA] Mode: fallback — invoking fallback diagnostic.")
         captcha_fallback.handle_captcha_failure(html, url, config)
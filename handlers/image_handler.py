@@ -2,8 +2,11 @@
 
 This module could handle tasks such as OCR on images, screenshot processing, or 
 image format conversion as needed by the scraping process.
+Batches of images are spread over the shared OCR worker pool.
 """
 
+from utils.ocr_pool import map_batch
+
 def process_image(image_bytes, config):
     """Process an image and extract information if needed.
 
@@ -23,3 +26,15 @@ def process_image(image_bytes, config):
     # - If OCR is needed, use pytesseract to extract text from the image.
     # - If image analysis is needed (like detecting content), integrate appropriate library.
     return result
+
+def process_images(image_bytes_list, config):
+    """Process several images in parallel on the shared OCR pool.
+
+    Args:
+        image_bytes_list (list[bytes]): The raw image data of each image.
+        config (dict): Scraper configuration, as for process_image.
+
+    Returns:
+        list: The result of processing each image, in input order.
+    """
+    return map_batch(process_image, list(image_bytes_list), config)
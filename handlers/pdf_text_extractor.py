@@ -2,8 +2,11 @@
 
 This module provides functionality to extract text content from PDF files.
 If the PDF is scanned (images only), it can use OCR (Optical Character Recognition) as a fallback.
+Batches of PDFs are spread over the shared OCR worker pool.
 """
 
+from utils.ocr_pool import map_batch
+
 def extract_text_from_pdf(file_path, config):
     """Extract text from a PDF file.
 
@@ -30,3 +33,15 @@ def extract_text_from_pdf(file_path, config):
     #     # use OCR on page images
     #     text_content = ocr_extract_from_pdf(file_path)
     return text_content
+
+def extract_text_from_pdfs(file_paths, config):
+    """Extract text from several PDF files in parallel on the shared OCR pool.
+
+    Args:
+        file_paths (list[str]): Paths to the PDF files.
+        config (dict): Scraper configuration, as for extract_text_from_pdf.
+
+    Returns:
+        list[str]: The extracted text of each file, in input order.
+    """
+    return map_batch(extract_text_from_pdf, list(file_paths), config)
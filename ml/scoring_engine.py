@@ -5,11 +5,56 @@ It scores a URL based on its path and keywords, and detects anomalies in the scr
 """
 
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlsplit
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Boost keywords reduce score.
+BOOST_KEYWORDS = ["docs", "api", "guide", "reference", "tutorial"]
+# Penalty keywords increase score.
+PENALTY_KEYWORDS = ["privacy", "legal", "unsubscribe", "logout", "terms"]
+
+_BOOSTS = frozenset(BOOST_KEYWORDS)
+# One pass over the path finds every keyword; the lookahead also reports keywords that
+# overlap one another, so the result matches a substring test per keyword.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, BOOST_KEYWORDS + PENALTY_KEYWORDS)) + "))", re.IGNORECASE
+)
+
+# Markers looked for in a page's HTML, found together in one case-insensitive pass.
+_TITLE_TAG = "<title>"
+_NOT_FOUND = "not found"
+_HTML_MARKERS_RE = re.compile(f"{re.escape(_TITLE_TAG)}|{re.escape(_NOT_FOUND)}", re.IGNORECASE)
+# The same pattern for raw, undecoded pages, so bytes are searched as they are.
+_HTML_MARKERS_BYTES_RE = re.compile(_HTML_MARKERS_RE.pattern.encode("ascii"), re.IGNORECASE)
+
+def _html_markers(html) -> set:
+    """Return which of the HTML markers occur in the page (str or bytes), stopping once all are found."""
+    if isinstance(html, (bytes, bytearray, memoryview)):
+        matches = (m.group().decode("ascii") for m in _HTML_MARKERS_BYTES_RE.finditer(html))
+    else:
+        matches = (m.group() for m in _HTML_MARKERS_RE.finditer(html))
+    found = set()
+    for match in matches:
+        found.add(match.lower())
+        if len(found) == 2:
+            break
+    return found
+
+def _score(url: str) -> float:
+    """Compute the heuristic score for one URL without logging."""
+    # Each keyword counts once, however often it appears.
+    found = {keyword.lower() for keyword in _KEYWORD_RE.findall(urlsplit(url).path)}
+    boosts = len(found & _BOOSTS)
+
+    score = 1.0 - 0.2 * boosts + 0.3 * (len(found) - boosts)
+    # Penalty for long URLs.
+    if len(url) > 120:
+        score += 0.2
+
+    return max(0, round(score, 2))
+
 def predict_url_score(url: str) -> float:
     """
     Heuristically score a URL based on path keywords.
@@ -21,28 +66,28 @@ def predict_url_score(url: str) -> float:
     Returns:
         float: A score between 0 and 1 (lower is higher priority).
     """
-    path = urlparse(url).path.lower()
-
-    # Boost keywords reduce score.
-    boosts = ["docs", "api", "guide", "reference", "tutorial"]
-    # Penalty keywords increase score.
-    penalties = ["privacy", "legal", "unsubscribe", "logout", "terms"]
-
-    score = 1.0
-    for boost in boosts:
-        if boost in path:
-            score -= 0.2
-    for penalty in penalties:
-        if penalty in path:
-            score += 0.3
-    # Penalty for long URLs.
-    if len(url) > 120:
-        score += 0.2
-
-    final_score = max(0, round(score, 2))
+    final_score = _score(url)
     logger.debug(f"[scoring_engine] Score for {url}: {final_score}")
     return final_score
 
+def predict_url_scores(urls: list) -> list:
+    """
+    Score a batch of URLs in one call.
+
+    Batch callers (such as the links discovered on one page) pay the call and logging
+    overhead once per batch instead of once per URL; a model-backed scorer can replace
+    this with a single vectorized prediction.
+
+    Args:
+        urls (list): The URLs to score.
+
+    Returns:
+        list: Scores in the same order as the input (lower is higher priority).
+    """
+    scores = [_score(url) for url in urls]
+    logger.debug(f"[scoring_engine] Scored batch of {len(scores)} URLs")
+    return scores
+
 def detect_scrape_anomalies(data: dict) -> list:
     """
     Detect anomalies in the scraped data.
@@ -54,7 +99,7 @@ def detect_scrape_anomalies(data: dict) -> list:
       - Indicators of a 404 error.
 
     Args:
-        data (dict): The scraped data with keys 'title', 'snippet', and 'html'.
+        data (dict): The scraped data with keys 'title', 'snippet', and 'html' (str or bytes).
 
     Returns:
         list: A list of anomaly messages.
@@ -63,15 +108,15 @@ def detect_scrape_anomalies(data: dict) -> list:
 
     title = data.get("title", "").strip()
     snippet = data.get("snippet", "").strip()
-    html = data.get("html", "").lower()
+    markers = _html_markers(data.get("html", ""))
 
     if not title or len(title) < 5:
         issues.append("Missing or short title")
     if not snippet or len(snippet) < 30:
         issues.append("Insufficient snippet text")
-    if "<title>" not in html:
+    if _TITLE_TAG not in markers:
         issues.append("HTML lacks <title> tag")
-    if "404" in title or "not found" in html:
+    if "404" in title or _NOT_FOUND in markers:
         issues.append("Potential 404 error")
 
     if issues:
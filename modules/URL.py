@@ -21,28 +21,28 @@ Usage:
 import argparse
 import os
 import sys
-import yaml
 import logging
 import asyncio
-from copy import deepcopy
+from collections import defaultdict
+from urllib.parse import urlsplit
 
 # Import the core orchestrator
 from core.scrape_orchestrator import start_scraping
+from modules.config_manager import load_yaml_cached
+from utils.logging_setup import configure_logging
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
+configure_logging(
     level=logging.INFO,
-    format="%(asctime)s:%(levelname)s:%(name)s:%(message)s",
+    fmt="%(asctime)s:%(levelname)s:%(name)s:%(message)s",
 )
 
 def load_global_config(config_path="configs/async_config.yaml"):
-    """Load the global configuration."""
+    """Load the global configuration (shared with the config cache; do not mutate it)."""
     if not os.path.exists(config_path):
         logger.error(f"Global config not found: {config_path}")
         sys.exit(1)
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
-    return config
+    return load_yaml_cached(config_path)
 
 def load_batch_jobs(batch_file="batch_urls.yaml"):
     """
@@ -53,31 +53,30 @@ def load_batch_jobs(batch_file="batch_urls.yaml"):
     if not os.path.exists(batch_file):
         logger.error(f"Batch jobs file not found: {batch_file}")
         sys.exit(1)
-    with open(batch_file, "r") as f:
-        jobs_config = yaml.safe_load(f) or {}
+    jobs_config = load_yaml_cached(batch_file) or {}
     jobs = jobs_config.get("batch_urls", [])
     if not jobs:
         logger.error("No batch jobs found in the batch file.")
         sys.exit(1)
-    # Sort jobs by priority (lower number means higher priority)
-    jobs.sort(key=lambda job: job.get("priority", 5))
-    return jobs
+    # Sort jobs by priority (lower number means higher priority); sorted() leaves the cached list as is.
+    return sorted(jobs, key=lambda job: job.get("priority", 5))
 
 def merge_configs(global_config, job_config):
     """
-    Recursively merge two dictionaries.
+    Recursively merge two dictionaries into a new one.
 
-    Values from job_config override those in global_config.
+    Values from job_config override those in global_config. Only the dicts along the paths
+    job_config overrides are copied; every other subtree is shared with the inputs, which
+    must therefore be treated as read-only.
     """
-    def merge(a, b):
-        for key, value in b.items():
-            if key in a and isinstance(a[key], dict) and isinstance(value, dict):
-                merge(a[key], value)
-            else:
-                a[key] = value
-        return a
-    merged = deepcopy(global_config)
-    return merge(merged, job_config)
+    merged = global_config.copy()
+    for key, value in job_config.items():
+        base = merged.get(key)
+        if isinstance(base, dict) and isinstance(value, dict):
+            merged[key] = merge_configs(base, value)
+        else:
+            merged[key] = value
+    return merged
 
 def parse_args():
     """Parse command-line arguments."""
@@ -94,25 +93,37 @@ async def run_single_url(global_config, url):
     logger.info(f"Running single URL: {url}")
     await start_scraping(global_config, url)
 
+async def _run_job(global_config, job, job_slots, domain_locks):
+    """Run one batch job once a slot and its domain are free, logging (not raising) failures."""
+    job_url = job["url"]
+    # Merge custom config into the global configuration
+    merged_config = merge_configs(global_config, job.get("custom_config", {}))
+    # Jobs for the same domain run one after another: each crawl has its own throttler, so
+    # concurrent jobs on one host would multiply its request rate.
+    async with domain_locks[urlsplit(job_url).netloc], job_slots:
+        # Log additional job metadata if provided
+        priority = job.get("priority", 5)
+        description = job.get("description", "")
+        logger.info(f"Starting job for URL: {job_url} (priority {priority}) - {description}")
+        try:
+            await start_scraping(merged_config, job_url)
+        except Exception:
+            logger.exception(f"Job for URL {job_url} failed")
+
 async def run_batch_jobs(global_config):
-    """Run batch jobs from batch_urls.yaml."""
+    """Run batch jobs from batch_urls.yaml, up to batch.concurrency of them at a time."""
     jobs = load_batch_jobs()
     logger.info(f"Loaded {len(jobs)} batch jobs.")
-    # For each job, merge its custom config (if any) with the global configuration
+    valid_jobs = []
     for job in jobs:
-        job_url = job.get("url")
-        if not job_url:
+        if not job.get("url"):
             logger.error("Job missing required URL.")
             continue
-        job_config = job.get("custom_config", {})
-        # Merge custom config into the global configuration
-        merged_config = merge_configs(global_config, job_config)
-        # Log additional job metadata if provided
-        priority = job.get("priority", 5)
-        description = job.get("description", "")
-        logger.info(f"Starting job for URL: {job_url} (priority {priority}) - {description}")
-        # Optionally, output_subdir and concurrency overrides could be handled here
-        await start_scraping(merged_config, job_url)
+        valid_jobs.append(job)
+    # Slots are taken in priority order, since jobs are sorted and start in list order.
+    job_slots = asyncio.Semaphore(global_config.get("batch", {}).get("concurrency", 8))
+    domain_locks = defaultdict(asyncio.Lock)
+    await asyncio.gather(*(_run_job(global_config, job, job_slots, domain_locks) for job in valid_jobs))
 
 def main():
     args = parse_args()
@@ -2,12 +2,48 @@
 
 This module loads the default configuration and any temporary overrides, 
 merges them, and validates the final configuration for use in the scraper.
+
+Parsed YAML files are cached per process by path, modification time and size, so repeated
+loads of an unchanged file (startups, batch jobs) skip parsing entirely.
 """
 
+import copy
 import os
 import yaml
+# libyaml's C loader, bundled with PyYAML's binary wheels; the pure-Python one otherwise.
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 # from schema import Schema, And, Or  # Example if using schema for validation
 
+_YAML_CACHE = {}  # abspath → (mtime_ns, size, parsed document)
+
+def load_yaml_cached(path):
+    """Load a YAML file, reusing the parsed document while the file is unchanged.
+
+    The file is parsed with libyaml's CSafeLoader when available. The returned object is shared by every
+    caller that loads the same file, so callers must copy it before mutating it.
+
+    Args:
+        path (str): Path to the YAML file.
+
+    Returns:
+        The parsed document (None for an empty file).
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
 def load_config():
     """Load and merge the scraper configuration from YAML files.
 
@@ -21,15 +57,14 @@ def load_config():
     base_config_path = os.path.join('configs', 'async_config.yaml')
     user_config_path = os.path.join('data', 'temp_config.yaml')  # user/job specific config
     try:
-        with open(base_config_path, 'r') as f:
-            config = yaml.safe_load(f) or {}
+        # Copied (like the user config below) so merging never touches the cached documents.
+        config = copy.deepcopy(load_yaml_cached(base_config_path)) or {}
     except FileNotFoundError:
         # If base config is missing, proceed with empty config (or default values)
         config = {}
     # If a temporary config exists, merge it on top of base config
     if os.path.exists(user_config_path):
-        with open(user_config_path, 'r') as f:
-            user_config = yaml.safe_load(f) or {}
+        user_config = copy.deepcopy(load_yaml_cached(user_config_path)) or {}
         # Merge user_config into base config (shallow merge for stub)
         for key, value in user_config.items():
             if isinstance(value, dict) and key in config:
@@ -1,27 +1,32 @@
 """Crawl Manager for One_Touch_Plus.
 
 This module manages the crawling queue and tracks visited URLs to prevent duplicate processing.
+URLs are queued per domain and domains are served round-robin, so one large site cannot
+starve the others and consecutive URLs from a domain stay together.
 """
 
 import logging
+from collections import deque
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
 class CrawlManager:
     def __init__(self, max_depth=3):
         """
-        Initialize the CrawlManager with an empty queue and visited set.
+        Initialize the CrawlManager with empty per-domain queues and visited set.
         
         Args:
             max_depth (int): The maximum depth for crawling.
         """
-        self.queue = []
+        self.queue = {}  # domain → deque of (url, depth)
+        self.domains = deque()  # domains with queued URLs, in round-robin order
         self.visited = set()
         self.max_depth = max_depth
 
     def add_url(self, url: str, depth: int):
         """
-        Add a URL to the crawl queue if it has not been visited yet.
+        Add a URL to its domain's crawl queue if it has not been visited yet.
         
         Args:
             url (str): The URL to enqueue.
@@ -30,15 +35,36 @@ class CrawlManager:
         if url in self.visited:
             logger.debug(f"Skipping duplicate URL: {url}")
             return  # Skip already visited URLs.
-        self.queue.append((url, depth))
+        domain = urlsplit(url).netloc
+        domain_queue = self.queue.get(domain)
+        if domain_queue is None:
+            domain_queue = self.queue[domain] = deque()
+            self.domains.append(domain)
+        domain_queue.append((url, depth))
         self.visited.add(url)
         logger.debug(f"Enqueued URL: {url} at depth {depth}")
 
-    def get_next_url(self):
+    def get_next_url(self, preferred_domain: str = None):
         """
-        Retrieve the next URL from the queue.
+        Retrieve the next URL, rotating through domains.
+
+        Args:
+            preferred_domain (str, optional): Domain to draw from out of turn if it still
+                has queued URLs, e.g. to keep a warm connection busy.
         
         Returns:
             tuple: A tuple of (url, depth) or None if the queue is empty.
         """
-        return self.queue.pop(0) if self.queue else None
+        if preferred_domain in self.queue:
+            domain = preferred_domain
+        elif self.domains:
+            domain = self.domains.popleft()
+            self.domains.append(domain)
+        else:
+            return None
+        domain_queue = self.queue[domain]
+        item = domain_queue.popleft()
+        if not domain_queue:
+            del self.queue[domain]
+            self.domains.remove(domain)
+        return item
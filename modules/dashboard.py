@@ -8,18 +8,66 @@ Also:
 - Formats the timestamp
 - Tracks session ID and duration
 - Exports metrics to CSV
+
+Connections are opened read-only, once per database, and reused with read-tuned pragmas, so
+repeated refreshes keep SQLite's page cache and memory map warm. Schema changes belong to the
+writer (OutputReporter); a database last written by an older crawler is migrated once, on
+open, through the writer's migrate_schema.
 """
 
+import atexit
 import sqlite3
 import logging
 import csv
 import os
-from urllib.parse import urlparse
+from contextlib import closing
 from datetime import datetime, timezone
+from pathlib import Path
 from uuid import uuid4
 
+from modules.output_reporter import SCHEMA_VERSION, migrate_schema, schema_version
+
 logger = logging.getLogger(__name__)
 
+_conns = {}  # db_path → open read-only connection
+
+def open_reader(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Open the crawl database read-only, first migrating it if an older crawler wrote it.
+
+    Args:
+        db_path (str): Path to an existing crawl database.
+        check_same_thread (bool): Passed to sqlite3.connect.
+
+    Returns:
+        sqlite3.Connection: A connection that cannot write to the database.
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    if schema_version(conn) < SCHEMA_VERSION:
+        conn.close()
+        with closing(sqlite3.connect(db_path)) as writer:
+            migrate_schema(writer)
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=check_same_thread)
+    return conn
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """Return the shared read-only connection for a database, opening it on first use."""
+    conn = _conns.get(db_path)
+    if conn is None:
+        conn = open_reader(db_path, check_same_thread=False)
+        conn.execute("PRAGMA mmap_size=1073741824")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _conns[db_path] = conn
+    return conn
+
+@atexit.register
+def close_all():
+    """Close every shared dashboard connection."""
+    while _conns:
+        _conns.popitem()[1].close()
+
 def format_timestamp(raw: str) -> str:
     """Convert '20250326_184130' → 'March 26, 2025 – 6:41 PM UTC'"""
     try:
@@ -48,42 +96,31 @@ def get_crawl_metrics(db_path: str) -> dict:
         return metrics
 
     try:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = _get_conn(db_path).cursor()
 
-        # Total records
-        cursor.execute("SELECT COUNT(*) FROM scraped_data")
-        metrics["total_records"] = cursor.fetchone()[0]
+        # Total records and time span in one pass over the ts_epoch index
+        cursor.execute("SELECT COUNT(*), MIN(ts_epoch), MAX(ts_epoch) FROM scraped_data")
+        metrics["total_records"], min_ts, max_ts = cursor.fetchone()
 
         if metrics["total_records"] == 0:
             logger.warning("[Dashboard] scraped_data table is empty.")
-            conn.close()
             return metrics
 
-        # Domain breakdown
-        cursor.execute("SELECT url FROM scraped_data")
-        urls = cursor.fetchall()
-        for (url,) in urls:
-            domain = urlparse(url).netloc or "unknown"
-            metrics["domain_counts"][domain] = metrics["domain_counts"].get(domain, 0) + 1
-
-        # Latest timestamp
-        cursor.execute("SELECT MAX(timestamp) FROM scraped_data")
-        latest_ts = cursor.fetchone()[0]
-        metrics["latest_timestamp"] = latest_ts
-        metrics["formatted_timestamp"] = format_timestamp(latest_ts)
-
-        # Duration
-        cursor.execute("SELECT MIN(timestamp), MAX(timestamp) FROM scraped_data")
-        min_ts, max_ts = cursor.fetchone()
-        try:
-            dt_min = datetime.strptime(min_ts, "%Y%m%d_%H%M%S")
-            dt_max = datetime.strptime(max_ts, "%Y%m%d_%H%M%S")
-            metrics["duration_secs"] = int((dt_max - dt_min).total_seconds())
-        except Exception as e:
-            logger.warning(f"[Dashboard] Timestamp parsing error: {e}")
+        # Domain breakdown, aggregated by SQLite so no URLs cross into Python
+        cursor.execute(
+            "SELECT COALESCE(NULLIF(domain, ''), 'unknown'), COUNT(*) FROM scraped_data GROUP BY 1"
+        )
+        metrics["domain_counts"] = dict(cursor.fetchall())
+
+        # Latest timestamp and duration
+        if max_ts is not None:
+            latest_ts = datetime.fromtimestamp(max_ts, timezone.utc).strftime("%Y%m%d_%H%M%S")
+            metrics["latest_timestamp"] = latest_ts
+            metrics["formatted_timestamp"] = format_timestamp(latest_ts)
+            metrics["duration_secs"] = max_ts - min_ts
+        else:
+            logger.warning("[Dashboard] No parseable timestamps in scraped_data.")
 
-        conn.close()
         logger.info("[Dashboard] Crawl metrics successfully retrieved.")
     except Exception as e:
         logger.error(f"[Dashboard] Failed to extract metrics: {e}")
@@ -100,17 +137,18 @@ def export_metrics_to_csv(metrics: dict, output_dir: str = "data"):
         filename = f"dashboard_metrics_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.csv"
         path = os.path.join(output_dir, filename)
 
-        with open(path, "w", newline="", encoding="utf-8") as f:
+        with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
             writer = csv.writer(f)
-            writer.writerow(["Metric", "Value"])
-            writer.writerow(["Session ID", metrics["session_id"]])
-            writer.writerow(["Total Records", metrics["total_records"]])
-            writer.writerow(["Latest Timestamp", metrics["formatted_timestamp"]])
-            writer.writerow(["Duration (seconds)", metrics["duration_secs"] or "N/A"])
-            writer.writerow([])
-            writer.writerow(["Domain", "Record Count"])
-            for domain, count in metrics["domain_counts"].items():
-                writer.writerow([domain, count])
+            writer.writerows([
+                ("Metric", "Value"),
+                ("Session ID", metrics["session_id"]),
+                ("Total Records", metrics["total_records"]),
+                ("Latest Timestamp", metrics["formatted_timestamp"]),
+                ("Duration (seconds)", metrics["duration_secs"] or "N/A"),
+                (),
+                ("Domain", "Record Count"),
+            ])
+            writer.writerows(metrics["domain_counts"].items())
 
         logger.info(f"[Dashboard] CSV written to {path}")
     except Exception as e:
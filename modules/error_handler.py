@@ -2,32 +2,46 @@
 
 import asyncio
 import functools
+import logging
+import random
 
-def async_retry(retries=3, delay=1):
-    """Decorator to retry an async function if it raises an exception.
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+def async_retry(retries=3, base=0.5, cap=10.0, retry_on=(aiohttp.ClientError, asyncio.TimeoutError)):
+    """Decorator to retry an async function if it raises a transient exception.
+
+    Waits between attempts with exponential backoff and full jitter: a random delay up to
+    min(cap, base * 2**attempt), so coroutines failing together don't retry in lockstep.
+    Exceptions outside retry_on (e.g. programming errors) are raised immediately.
 
     Args:
-        retries (int): Number of retry attempts before giving up.
-        delay (int): Delay in seconds between retries.
+        retries (int): Number of attempts before giving up; the function is always called once.
+        base (float): Backoff ceiling in seconds after the first failed attempt, doubled per attempt.
+        cap (float): Upper bound on the delay between attempts, in seconds.
+        retry_on (tuple): Exception types that are worth retrying.
 
     Returns:
         function: A wrapper function that encapsulates the retry logic around the original coroutine.
     """
+    attempts = max(1, retries)
+
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            last_exception = None
-            for attempt in range(1, retries + 1):
+            for attempt in range(1, attempts + 1):
                 try:
                     return await func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    # TODO: Add logging of the exception if logger is available.
+                except retry_on as e:
+                    if attempt == attempts:
+                        logger.error(f"[Retry] {func.__name__} failed after {attempts} attempts: {e}")
+                        raise
+                    delay = random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+                    logger.warning(
+                        f"[Retry] {func.__name__} failed (attempt {attempt}/{attempts}): {e}; "
+                        f"retrying in {delay:.2f}s"
+                    )
                     await asyncio.sleep(delay)
-            # If we exit loop without returning, all retries failed
-            # Optionally, re-raise the last exception
-            # For now, just return or raise the last exception after exhausting retries.
-            if last_exception:
-                raise last_exception
         return wrapper
     return decorator
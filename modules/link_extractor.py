@@ -1,18 +1,68 @@
 """Link extraction utility for One_Touch_Plus.
 
-This module extracts and filters anchor links from HTML content using BeautifulSoup.
+This module extracts and filters anchor links from HTML content.
 It applies same-domain filtering, regex-based exclusions, and supports whitelist/blacklist
 rules for both URL paths and query parameters, as driven by the configuration.
+
+Hrefs are collected with selectolax's C parser when it is installed, falling back to lxml.
+Both are far faster than building a BeautifulSoup tree just to read anchor attributes.
 """
 
-from urllib.parse import urlparse, urljoin, parse_qs
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from urllib.parse import urlsplit, urljoin, parse_qs, parse_qsl
+import lxml.etree
+import lxml.html
 import re
 import logging
 
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Not installed, or too old to have the lexbor backend
+    HTMLParser = None
+
 logger = logging.getLogger(__name__)
 
-def extract_links(html: str, base_url: str, config: dict) -> list:
+# Navigation links repeat on every page of a site, so their splits are worth keeping well
+# beyond urlsplit's own 128-entry cache.
+_split_url = lru_cache(maxsize=1 << 16)(urlsplit)
+
+# Hrefs that can never yield a crawlable link: in-page anchors and non-HTTP schemes.
+_SKIP_HREF_PREFIXES = ("#", "javascript:", "mailto:", "tel:", "data:")
+
+def _query_keys(query: str) -> list:
+    """
+    Return the parameter names of a query string, without building a parse_qs dict.
+
+    Names are the keys parse_qs would produce: percent-decoded, with '+' read as a space, and
+    leaving out blank-valued parameters such as a bare '?ref'.
+    """
+    return [key for key, _ in parse_qsl(query)]
+
+def _extract_hrefs(html: str) -> list:
+    """Return the href value of every anchor in the HTML, in document order."""
+    if not html or not html.strip():
+        return []
+    if HTMLParser is not None:
+        hrefs = (a.attributes.get("href") for a in HTMLParser(html).css("a[href]"))
+        return [href for href in hrefs if href is not None]
+    try:
+        # XPath hands back the attribute strings directly, without wrapping each element.
+        return lxml.html.fromstring(html).xpath("//a/@href")
+    except lxml.etree.ParserError:  # e.g. a document holding nothing but a comment
+        return []
+
+@lru_cache(maxsize=32)
+def _compile_union(patterns: tuple, flags: int = re.IGNORECASE):
+    """Compile regex patterns into one alternation, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+def _compile_substrings(substrings):
+    """Compile literal substrings into one case-sensitive regex that finds any of them, or None."""
+    return _compile_union(tuple(re.escape(s) for s in substrings), 0)
+
+def extract_links(html: str, base_url: str, config: dict, base_split=None) -> list:
     """
     Extracts and filters anchor links from the given HTML content.
 
@@ -20,70 +70,96 @@ def extract_links(html: str, base_url: str, config: dict) -> list:
         html (str): The HTML content to parse.
         base_url (str): The URL of the page where the content came from.
         config (dict): Scraper configuration, which may include filtering rules.
+        base_split (SplitResult, optional): The base URL's urlsplit() result, if already computed.
 
     Returns:
         list: A list of filtered, fully-qualified URLs.
     """
-    soup = BeautifulSoup(html, "lxml")
     found_links = set()
-    base_domain = urlparse(base_url).netloc
+    base_domain = (base_split or urlsplit(base_url)).netloc
+    # Any same-domain link starts with one of these; checking that is cheaper than splitting.
+    domain_prefixes = (f"http://{base_domain}", f"https://{base_domain}")
 
     crawl_cfg = config.get("crawl", {})
 
     same_domain_only = crawl_cfg.get("same_domain_only", True)
-    exclude_query_keys = crawl_cfg.get("exclude_query_keys", ["utm_", "ref", "session"])
-    include_query_values = crawl_cfg.get("include_query_values", {})  # e.g. {"source": ["trusted", "api"]}
-    whitelist_paths = crawl_cfg.get("whitelist_paths", [])
-    blacklist_paths = crawl_cfg.get("blacklist_paths", [])
-    exclude_patterns = crawl_cfg.get("exclude_patterns", [])
-    whitelist_patterns = crawl_cfg.get("whitelist_patterns", [])
-    blacklist_patterns = crawl_cfg.get("blacklist_patterns", [])
-
-    for tag in soup.find_all("a", href=True):
-        raw_href = tag["href"].strip()
-        full_url = urljoin(base_url, raw_href)
-        parsed = urlparse(full_url)
-        query_params = parse_qs(parsed.query)
+    exclude_query_keys = tuple(crawl_cfg.get("exclude_query_keys", ["utm_", "ref", "session"]))
+    # e.g. {"source": ["trusted", "api"]}; allowed values as sets for the per-link check.
+    include_query_values = {
+        key: frozenset(allowed) for key, allowed in crawl_cfg.get("include_query_values", {}).items()
+    }
+    # Path lists become one regex each, so a path is checked against all of them in one scan.
+    whitelist_paths_re = _compile_substrings(crawl_cfg.get("whitelist_paths", []))
+    blacklist_paths_re = _compile_substrings(crawl_cfg.get("blacklist_paths", []))
+    whitelist_re = _compile_union(tuple(crawl_cfg.get("whitelist_patterns", [])))
+    # Blacklist and exclude patterns reject the same way, so one regex covers both.
+    reject_re = _compile_union(
+        tuple(crawl_cfg.get("blacklist_patterns", [])) + tuple(crawl_cfg.get("exclude_patterns", []))
+    )
+
+    # Bound once: these are looked up for every link.
+    join, split, add = urljoin, _split_url, found_links.add
+
+    # Filters run cheapest and most selective first, so most links are rejected before the
+    # split, query parsing and regexes.
+    for raw_href in _extract_hrefs(html):
+        href = raw_href.strip()
+        if href[:11].lower().startswith(_SKIP_HREF_PREFIXES):
+            continue
+        try:
+            full_url = join(base_url, href)
+            if same_domain_only and not full_url.startswith(domain_prefixes):
+                # urljoin keeps an absolute href's scheme as written, so "HTTPS://" can still be
+                # the base domain; compare with the scheme lowercased, as urlsplit reports it.
+                scheme, sep, rest = full_url.partition("://")
+                if not sep or not f"{scheme.lower()}://{rest}".startswith(domain_prefixes):
+                    continue
+            parsed = split(full_url)
+        except ValueError:  # A malformed href, e.g. unbalanced IPv6 brackets; skip just this one.
+            continue
 
         # Scheme & fragment filter: only process HTTP/HTTPS URLs without fragments.
         if not parsed.scheme.startswith("http") or parsed.fragment:
             continue
 
-        # Domain filtering: enforce same domain if configured.
+        # Domain filtering: enforce same domain if configured (the prefix check above lets
+        # through hosts that merely start with the base domain).
         if same_domain_only and parsed.netloc != base_domain:
             continue
 
         # Query parameter filtering: skip if any query key starts with an excluded term.
-        if any(any(key.startswith(excl) for excl in exclude_query_keys) for key in query_params):
+        if exclude_query_keys and parsed.query and any(
+            key.startswith(exclude_query_keys) for key in _query_keys(parsed.query)
+        ):
             continue
 
         # Optional: include only records where specific query param keys have allowed values.
         if include_query_values:
-            valid = all(
-                any(val in query_params.get(k, []) for val in allowed)
-                for k, allowed in include_query_values.items()
-            )
-            if not valid:
+            query_params = parse_qs(parsed.query)
+            if not all(
+                not allowed.isdisjoint(query_params.get(key, ()))
+                for key, allowed in include_query_values.items()
+            ):
                 continue
 
         # Path-level filtering.
         path = parsed.path or "/"
         # Whitelist: if provided, only include links whose path contains at least one allowed substring.
-        if whitelist_paths and not any(allowed in path for allowed in whitelist_paths):
+        if whitelist_paths_re is not None and not whitelist_paths_re.search(path):
             continue
         # Blacklist: skip if path contains any disallowed substring.
-        if any(bad in path for bad in blacklist_paths):
+        if blacklist_paths_re is not None and blacklist_paths_re.search(path):
             continue
 
         # Regex-based filtering:
         # If whitelist_patterns are provided, only include links that match at least one.
-        if whitelist_patterns and not any(re.search(pattern, full_url, re.IGNORECASE) for pattern in whitelist_patterns):
+        if whitelist_re is not None and not whitelist_re.search(full_url):
             continue
         # Exclude links that match any blacklist or exclude pattern.
-        if any(re.search(pattern, full_url, re.IGNORECASE) for pattern in blacklist_patterns + exclude_patterns):
+        if reject_re is not None and reject_re.search(full_url):
             continue
 
-        found_links.add(full_url)
+        add(full_url)
 
     logger.info(f"[extract_links] {len(found_links)} links passed filtering.")
     return list(found_links)
@@ -1,123 +1,345 @@
 """Output reporting module for One_Touch_Plus.
 
 Aggregates and outputs crawl results in batch mode. Supports JSON, CSV, JSONL, or SQLite.
+
+JSONL and CSV records are always streamed as they arrive into one file per reporter session,
+so memory stays flat however long the crawl runs; batch_mode only affects JSON, which is then
+collected and written as one indented document by finalize(). A streamed file that reaches
+`max_file_bytes` (256 MiB by default) is completed and closed, and the next record starts a
+new one. Streamed CSV and JSON go through a long-lived, 1 MiB-buffered handle (binary for
+JSON, which is encoded to bytes); CSV columns come from `csv_columns` in the config, or else
+are fixed by the first record.
+JSONL skips Python's io layer: encoded lines are collected and appended to an O_APPEND file
+descriptor with one writev call per WRITE_BUFFER_SIZE bytes (or JSONL_BATCH_SIZE records).
+
+SQLite output is written as the crawl runs: rows are buffered and inserted with executemany
+in one transaction per batch, on a WAL-mode connection, so commits (and their fsyncs) happen
+once per batch rather than once per page and the dashboard can read while the crawl writes.
+Each row also stores its write time as integer epoch seconds (ts_epoch, indexed), so readers
+can filter and sort by time without parsing the timestamp strings.
+
+Records failing OutputValidator (e.g. missing a `validation.required_fields` key) are
+skipped as they arrive, in the same pass that writes the others.
+
+Records are written as given. The crawler leaves out the raw page HTML (usually the bulk of
+a record) unless `include_html` is set; SQLite then leaves the html column NULL.
+
+Records are serialized with orjson when it is installed, falling back to the json module.
 """
 
 import logging
 import os
 import json
 import csv
+import itertools
 import sqlite3
+import time
 from datetime import datetime
 
+from modules.output_validator import OutputValidator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+SQLITE_BATCH_SIZE = 500
+JSONL_BATCH_SIZE = 256
+WRITE_BUFFER_SIZE = 1 << 20
+MAX_FILE_BYTES = 256 << 20
+
+_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS scraped_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT,
+        title TEXT,
+        snippet TEXT,
+        html TEXT,
+        timestamp TEXT,
+        ts_epoch INTEGER
+    )
+"""
+# One constant string, so every batch hits the connection's prepared-statement cache.
+_INSERT_SQL = (
+    "INSERT INTO scraped_data (url, title, snippet, html, timestamp, ts_epoch) VALUES (?, ?, ?, ?, ?, ?)"
+)
+_prepared_dbs = set()  # Database paths whose schema this process has already set up
+_file_seq = itertools.count()  # Distinguishes report files opened within the same second
+
+# Host part of the URL (everything between "://" and the next "/"), as SQL.
+_REST = "substr(url, instr(url, '://') + 3)"
+DOMAIN_SQL = (
+    f"CASE WHEN instr(url, '://') = 0 THEN NULL "
+    f"WHEN instr({_REST}, '/') > 0 THEN substr({_REST}, 1, instr({_REST}, '/') - 1) "
+    f"ELSE {_REST} END"
+)
+
+# Converts a stored '%Y%m%d_%H%M%S' (UTC) timestamp to epoch seconds.
+_TIMESTAMP_TO_EPOCH_SQL = (
+    "CAST(strftime('%s', substr(timestamp, 1, 4) || '-' || substr(timestamp, 5, 2) || '-' || "
+    "substr(timestamp, 7, 2) || ' ' || substr(timestamp, 10, 2) || ':' || "
+    "substr(timestamp, 12, 2) || ':' || substr(timestamp, 14, 2)) AS INTEGER)"
+)
+
+def ensure_ts_epoch(conn: sqlite3.Connection):
+    """
+    Add and backfill the ts_epoch column and its index on databases created before it existed.
+
+    Args:
+        conn (sqlite3.Connection): Connection to a database holding scraped_data.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(scraped_data)")}
+    if "ts_epoch" not in columns:
+        conn.execute("ALTER TABLE scraped_data ADD COLUMN ts_epoch INTEGER")
+        conn.execute(f"UPDATE scraped_data SET ts_epoch = {_TIMESTAMP_TO_EPOCH_SQL}")
+        logger.info("[OutputReporter] Added and backfilled ts_epoch column")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ts ON scraped_data(ts_epoch)")
+
+def _add_domain_column(conn: sqlite3.Connection):
+    """Add the virtual domain column that the dashboard filters and groups by."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(scraped_data)")}
+    if "domain" not in columns:
+        conn.execute(
+            f"ALTER TABLE scraped_data ADD COLUMN domain TEXT GENERATED ALWAYS AS ({DOMAIN_SQL}) VIRTUAL"
+        )
+
+def _index_domain_epoch(conn: sqlite3.Connection):
+    """Index the dashboard's domain + time filters, replacing the older timestamp-string index."""
+    conn.execute("DROP INDEX IF EXISTS idx_domain_ts")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_domain_epoch ON scraped_data(domain, ts_epoch)")
+
+# Schema upgrades, in order; PRAGMA user_version counts how many a database has had. Each step
+# is idempotent, since databases from before versioning may already carry some of its changes.
+_MIGRATIONS = [ensure_ts_epoch, _add_domain_column, _index_domain_epoch]
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Return the number of _MIGRATIONS applied to the database behind conn."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate_schema(conn: sqlite3.Connection):
+    """
+    Create scraped_data if needed and apply any pending migrations, in one transaction.
+
+    Costs a single pragma read once the database is current.
+
+    Args:
+        conn (sqlite3.Connection): Read-write connection to the crawl database.
+    """
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = schema_version(conn)  # Another process may have migrated while we waited.
+        if version < SCHEMA_VERSION:
+            conn.execute(_SCHEMA_SQL)
+            for migration in _MIGRATIONS[version:]:
+                migration(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    if version < SCHEMA_VERSION:
+        logger.info(f"[OutputReporter] Migrated database schema from version {version} to {SCHEMA_VERSION}")
+
+def _dumps_bytes(obj, indent: bool = False, newline: bool = False) -> bytes:
+    """Serialize a record (or list of records) to UTF-8 JSON, non-ASCII characters kept as is."""
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_APPEND_NEWLINE if newline else 0)
+        return orjson.dumps(obj, option=option)
+    text = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+def _write_all(fd: int, chunks: list):
+    """Write byte chunks to a file descriptor, in one writev call where the platform has it."""
+    written = os.writev(fd, chunks) if hasattr(os, "writev") else 0
+    if written < sum(map(len, chunks)):  # No writev, or a short write: send the rest in one piece.
+        view = memoryview(b"".join(chunks))[written:]
+        while view:
+            view = view[os.write(fd, view):]
+
 class OutputReporter:
     def __init__(self, config=None):
         self.config = config or {}
         self.output_dir = self.config.get("output_dir", "data")
         self.output_format = self.config.get("output_format", "jsonl").lower()
         self.batch_mode = self.config.get("batch_mode", True)
+        self.validator = OutputValidator(self.config)
+        self.max_file_bytes = self.config.get("max_file_bytes") or MAX_FILE_BYTES
         os.makedirs(self.output_dir, exist_ok=True)
         self.results = []
+        self._conn = None  # SQLite connection, opened on the first flush
+        self._fh = None  # Streaming CSV/JSON output file, opened on the first record
+        self._csv_writer = None
+        self._csv_cols = ()  # CSV column order, fixed when the file is opened
+        self._fd = None  # Streaming JSONL file descriptor, opened on the first record
+        self._pending = []  # Encoded JSONL lines not yet written to _fd
+        self._pending_bytes = 0
+        self._file_bytes = 0  # Bytes written to the current streamed file
 
     def generate_report(self, data):
-        if self.batch_mode:
+        if not self.validator.validate(data):
+            url = data.get("url") if isinstance(data, dict) else None
+            logger.warning("[OutputReporter] Skipping invalid record (url: %s)", url)
+            return
+        if self.output_format == "sqlite":
+            self.results.append(data)
+            if len(self.results) >= SQLITE_BATCH_SIZE:
+                self.flush()
+        elif self.batch_mode and self.output_format == "json":
             self.results.append(data)
         else:
             self._write_single(data)
 
+    def generate_reports(self, batch):
+        """Report each record of a batch in turn; see generate_report()."""
+        for data in batch:
+            self.generate_report(data)
+
+    def flush(self):
+        """Write buffered SQLite rows or streamed records now; batch JSON is only written by finalize()."""
+        if self.output_format == "sqlite" and self.results:
+            now = time.time()
+            self._save_sqlite(datetime.utcfromtimestamp(now).strftime("%Y%m%d_%H%M%S"), int(now))
+        elif self._fh is not None:
+            self._fh.flush()
+        elif self._pending:
+            self._write_pending()
+
     def finalize(self):
+        if self.output_format == "sqlite":
+            self.flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            return
+        self._close_stream()
         if not self.batch_mode or not self.results:
             return
+        self._save_json()
+
+    def _close_stream(self):
+        """Complete and close the current streamed file; the next record starts a new one."""
+        self._file_bytes = 0
+        if self._fh is not None:
+            if self.output_format == "json":
+                self._fh.write(b"\n]\n")
+            self._fh.close()
+            logger.info(f"[OutputReporter] Closed streamed report {self._fh.name}")
+            self._fh = None
+            self._csv_writer = None
+        if self._fd is not None:
+            try:
+                self._write_pending()
+                os.fsync(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+            logger.info("[OutputReporter] Closed streamed JSONL report")
+
+    def _report_path(self, extension):
+        """Return a fresh report file path; reporters started in the same second never share one."""
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        if self.output_format == "csv":
-            self._save_csv(timestamp)
-        elif self.output_format == "jsonl":
-            self._save_jsonl(timestamp)
-        elif self.output_format == "sqlite":
-            self._save_sqlite(timestamp)
-        else:
-            self._save_json(timestamp)
+        name = f"scrape_results_{timestamp}_{os.getpid()}_{next(_file_seq)}.{extension}"
+        return os.path.join(self.output_dir, name)
 
-    def _save_json(self, timestamp):
+    def _save_json(self):
         try:
-            filename = os.path.join(self.output_dir, f"scrape_results_{timestamp}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.results, f, ensure_ascii=False, indent=2)
+            filename = self._report_path("json")
+            # Encoded straight to bytes: one write, no decode/re-encode round trip.
+            with open(filename, "wb") as f:
+                f.write(_dumps_bytes(self.results, indent=True))
             logger.info(f"[OutputReporter] Saved JSON report to {filename}")
         except Exception as e:
             logger.error(f"[OutputReporter] Failed to save JSON report: {e}")
 
-    def _save_csv(self, timestamp):
-        try:
-            filename = os.path.join(self.output_dir, f"scrape_results_{timestamp}.csv")
-            keys = self.results[0].keys()
-            with open(filename, "w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(f, fieldnames=keys)
-                writer.writeheader()
-                writer.writerows(self.results)
-            logger.info(f"[OutputReporter] Saved CSV report to {filename}")
-        except Exception as e:
-            logger.error(f"[OutputReporter] Failed to save CSV report: {e}")
-
-    def _save_jsonl(self, timestamp):
-        try:
-            filename = os.path.join(self.output_dir, f"scrape_results_{timestamp}.jsonl")
-            with open(filename, "w", encoding="utf-8") as f:
-                for record in self.results:
-                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
-            logger.info(f"[OutputReporter] Saved JSONL report to {filename}")
-        except Exception as e:
-            logger.error(f"[OutputReporter] Failed to save JSONL report: {e}")
+    def _connect_sqlite(self, db_path):
+        key = os.path.abspath(db_path)
+        prepared = key in _prepared_dbs and os.path.exists(db_path)  # Recreated if deleted meanwhile.
+        # The reporter is driven from worker threads, one call at a time.
+        conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        conn.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;")
+        if not prepared:
+            migrate_schema(conn)
+            _prepared_dbs.add(key)
+        return conn
 
-    def _save_sqlite(self, timestamp):
+    def _save_sqlite(self, timestamp, ts_epoch):
         db_path = self.config.get("db_path", "data/crawler.db")
+        batch, self.results = self.results, []
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scraped_data (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT,
-                    title TEXT,
-                    snippet TEXT,
-                    html TEXT,
-                    timestamp TEXT
-                )
-            """)
-            for row in self.results:
-                cursor.execute("""
-                    INSERT INTO scraped_data (url, title, snippet, html, timestamp)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    row.get("url"),
-                    row.get("title"),
-                    row.get("snippet"),
-                    row.get("html"),
-                    timestamp
-                ))
-            conn.commit()
-            conn.close()
-            logger.info(f"[OutputReporter] Wrote batch to SQLite: {db_path}")
+            if self._conn is None:
+                self._conn = self._connect_sqlite(db_path)
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(_INSERT_SQL, [
+                    (row.get("url"), row.get("title"), row.get("snippet"), row.get("html"),
+                     timestamp, ts_epoch)
+                    for row in batch
+                ])
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            logger.info(f"[OutputReporter] Wrote batch of {len(batch)} rows to SQLite: {db_path}")
         except Exception as e:
             logger.error(f"[OutputReporter] SQLite write failed: {e}")
 
+    def _write_pending(self):
+        chunks, self._pending = self._pending, []
+        self._pending_bytes = 0
+        try:
+            _write_all(self._fd, chunks)
+        except OSError as e:
+            logger.error(f"[OutputReporter] Failed to write {len(chunks)} JSONL records: {e}")
+
     def _write_single(self, data):
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        filename = os.path.join(self.output_dir, f"scrape_results_{timestamp}.{self.output_format}")
+        if self.output_format == "jsonl":
+            try:
+                if self._fd is None:
+                    filename = self._report_path("jsonl")
+                    self._fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    logger.info(f"[OutputReporter] Streaming records to {filename}")
+                line = _dumps_bytes(data, newline=True)
+                self._pending.append(line)
+                self._pending_bytes += len(line)
+                self._file_bytes += len(line)
+            except Exception as e:
+                logger.error(f"[OutputReporter] Failed to write record: {e}")
+                return
+            if self._file_bytes >= self.max_file_bytes:
+                self._close_stream()
+            elif self._pending_bytes >= WRITE_BUFFER_SIZE or len(self._pending) >= JSONL_BATCH_SIZE:
+                self._write_pending()
+            return
         try:
+            first = self._fh is None
+            if first:
+                filename = self._report_path(self.output_format)
+                if self.output_format == "csv":
+                    self._fh = open(filename, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_SIZE)
+                else:  # JSON is encoded straight to bytes, so skip the text layer.
+                    self._fh = open(filename, "wb", buffering=WRITE_BUFFER_SIZE)
+                logger.info(f"[OutputReporter] Streaming records to {filename}")
             if self.output_format == "csv":
-                with open(filename, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=data.keys())
-                    writer.writeheader()
-                    writer.writerow(data)
-            elif self.output_format == "jsonl":
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+                if first:
+                    if not self._csv_cols:  # Rotated files keep the first file's columns.
+                        self._csv_cols = tuple(self.config.get("csv_columns") or data.keys())
+                    self._csv_writer = csv.writer(self._fh)
+                    self._file_bytes += self._csv_writer.writerow(self._csv_cols)
+                get = data.get
+                # writerow returns the characters written, close enough to bytes for rotation.
+                self._file_bytes += self._csv_writer.writerow([get(col, "") for col in self._csv_cols])
             else:
-                with open(filename, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
-            logger.info(f"[OutputReporter] Saved single record to {filename}")
+                # A JSON array, opened here and closed by _close_stream().
+                self._file_bytes += self._fh.write(b"[\n" if first else b",\n")
+                self._file_bytes += self._fh.write(_dumps_bytes(data, indent=True))
         except Exception as e:
-            logger.error(f"[OutputReporter] Failed to save single record: {e}")
+            logger.error(f"[OutputReporter] Failed to write record: {e}")
+            return
+        if self._file_bytes >= self.max_file_bytes:
+            self._close_stream()
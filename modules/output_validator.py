@@ -2,6 +2,7 @@
 
 The OutputValidator checks that the data scraped meets certain criteria or formats.
 This can include ensuring required fields are present, values are in expected range, etc.
+Required fields are listed under `validation.required_fields` in the config.
 """
 
 class OutputValidator:
@@ -13,8 +14,9 @@ class OutputValidator:
             config (dict): Configuration that may include validation rules or schema.
         """
         self.config = config
-        # TODO: Extract or define validation rules from config if applicable
-    
+        # Resolved once here so validate() does no config lookups per record.
+        self._required = tuple((config or {}).get("validation", {}).get("required_fields") or ())
+
     def validate(self, data):
         """Validate a single scraped data item or a collection of data.
 
@@ -24,16 +26,7 @@ class OutputValidator:
         Returns:
             bool: True if data is considered valid, False if it fails validation.
         """
-        if data is None:
-            return False
-        if not isinstance(data, dict):
-            # Only expecting dictionary data structures for now
+        if not data or not isinstance(data, dict):
+            # Only expecting non-empty dictionary data structures for now
             return False
-        # TODO: Implement actual validation logic, e.g. required keys present or values format.
-        # For now, assume data is valid if it is a non-empty dictionary.
-        # Example:
-        # required_fields = self.config.get('validation', {}).get('required_fields', [])
-        # for field in required_fields:
-        #     if field not in data:
-        #         return False
-        return True if data else False
+        return all(field in data for field in self._required)
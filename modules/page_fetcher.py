@@ -1,52 +1,119 @@
 """Page fetching logic for One_Touch_Plus.
 
 This module asynchronously fetches HTML content using aiohttp,
-parses the title and snippet using BeautifulSoup,
-and includes retry logic for resilience.
+extracts the title and a text snippet without building a Python-level DOM.
+Failed requests are not retried here: an empty result sends the URL to the crawl's
+RetryQueue, which owns backoff.
+
+The snippet text comes from selectolax's C parser when it is installed, falling back to lxml.
+
+A crawl passes one shared aiohttp.ClientSession (see make_session) so connections, TLS
+sessions and DNS lookups are reused across requests instead of being set up per URL.
 """
 
 import aiohttp
-from bs4 import BeautifulSoup
+import html as html_lib
 import logging
-from utils.retry_handler import with_retries  # Retry decorator for resilience
+import re
+import lxml.etree
+import lxml.html
+from utils.retry_handler import UnrecoverableError
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:  # Not installed, or too old to have the lexbor backend
+    HTMLParser = None
 
 logger = logging.getLogger(__name__)
 
-@with_retries(max_retries=3, delay=1, backoff=2)
-async def fetch_page(url: str, config: dict) -> dict:
+SNIPPET_LENGTH = 300
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+
+def _extract_title(html: str) -> str:
+    """Return the page's <title> text; the regex stops at the first title, near the top."""
+    match = _TITLE_RE.search(html)
+    return html_lib.unescape(match.group(1)).strip() if match else "Untitled"
+
+def _extract_snippet(html: str) -> str:
+    """Return the first SNIPPET_LENGTH characters of the page's text."""
+    if HTMLParser is not None:
+        body = HTMLParser(html).body
+        return body.text(separator=" ", strip=True)[:SNIPPET_LENGTH] if body is not None else ""
+    try:
+        try:
+            root = lxml.html.fromstring(html)
+        except ValueError:  # A str starting with an XML encoding declaration must be parsed as bytes.
+            root = lxml.html.fromstring(html.encode("utf-8"))
+    except lxml.etree.ParserError:  # e.g. an empty document
+        return ""
+    return root.text_content()[:SNIPPET_LENGTH]
+
+def make_session(config: dict, max_connections: int = 100) -> aiohttp.ClientSession:
+    """
+    Create the connection-pooled session shared by every fetch of a crawl.
+
+    Must be called from a running event loop; the caller is responsible for closing it.
+
+    Args:
+        config (dict): Scraper configuration (may include headers).
+        max_connections (int): Total size of the connection pool.
+
+    Returns:
+        aiohttp.ClientSession: The shared session.
+    """
+    headers = {"Accept-Encoding": "gzip, deflate", **config.get("headers", {})}
+    connector = aiohttp.TCPConnector(
+        limit=max_connections,
+        ttl_dns_cache=300,  # Resolve each host once per five minutes, not once per request.
+    )
+    timeout = aiohttp.ClientTimeout(total=30, connect=10)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers)
+
+async def fetch_page(url: str, config: dict, session: aiohttp.ClientSession = None) -> dict:
     """
     Fetch a web page and extract its title, snippet, and raw HTML.
 
     Args:
         url (str): The URL to fetch.
         config (dict): Scraper configuration (may include headers, timeout, etc.).
+        session (aiohttp.ClientSession, optional): Shared session from make_session; a
+            short-lived one is created for this request if not given.
 
     Returns:
-        dict: Contains 'url', 'title', 'snippet', and 'html'.
+        dict: Contains 'url', 'title', 'snippet', and 'html'; just 'url' and 'status' for
+        a non-200 response, and empty if the request failed.
+
+    Raises:
+        UnrecoverableError: If the server answers with a permanent 4xx status.
     """
     try:
-        timeout = aiohttp.ClientTimeout(total=10)
-        headers = config.get("headers", {})  # Optional headers from config
-
-        async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    logger.warning(f"[fetch_page] Non-200 response for {url}: {response.status}")
-                    return {}
-
-                html = await response.text()
-                soup = BeautifulSoup(html, "lxml")
-                title = soup.title.string.strip() if soup.title else "Untitled"
-                snippet = soup.get_text()[:300]  # First 300 characters as preview
-
-                logger.info(f"[fetch_page] Fetched {url} successfully with title: '{title}'")
-                return {
-                    "url": url,
-                    "title": title,
-                    "snippet": snippet,
-                    "html": html
-                }
-
+        if session is None:
+            async with make_session(config, max_connections=1) as own_session:
+                return await _fetch(url, own_session)
+        return await _fetch(url, session)
+    except UnrecoverableError:
+        raise
     except Exception as e:
         logger.error(f"[fetch_page] Error fetching {url}: {e}")
         return {}
+
+async def _fetch(url: str, session: aiohttp.ClientSession) -> dict:
+    async with session.get(url) as response:
+        # 408 and 429 are transient; any other 4xx will not change on a retry.
+        if 400 <= response.status < 500 and response.status not in (408, 429):
+            raise UnrecoverableError(f"HTTP {response.status} for {url}")
+        if response.status != 200:
+            logger.warning(f"[fetch_page] Non-200 response for {url}: {response.status}")
+            return {"url": url, "status": response.status}
+
+        html = await response.text()
+        title = _extract_title(html)
+        snippet = _extract_snippet(html)  # First 300 characters as preview
+
+        logger.info(f"[fetch_page] Fetched {url} successfully with title: '{title}'")
+        return {
+            "url": url,
+            "title": title,
+            "snippet": snippet,
+            "html": html
+        }
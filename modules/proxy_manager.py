@@ -1,32 +1,70 @@
 """Proxy management for web requests.
 
-This module provides a ProxyManager class to handle rotating proxies 
+This module provides a ProxyManager class to handle rotating proxies
 to avoid IP blocking and distribute requests across multiple IP addresses.
+
+Proxies are handed out round-robin from an itertools.cycle. Each next() call is a single C
+call, so coroutines sharing the manager never receive the same slot twice. A proxy reported
+as failing is skipped until its cool-down expires.
 """
 
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
 class ProxyManager:
     """Manages a list of proxies and provides proxies for outgoing requests."""
-    def __init__(self, proxy_list=None):
+    def __init__(self, proxy_list=None, cooldown: float = 60):
         """Initialize the ProxyManager with an optional list of proxies.
 
         Args:
             proxy_list (list, optional): A list of proxy addresses (strings).
+            cooldown (float): Seconds a proxy is skipped after report_failure().
         """
         self.proxy_list = proxy_list or []
-        self.index = 0  # index for the next proxy to use
+        self.cooldown = cooldown
+        self._iter = itertools.cycle(self.proxy_list)
+        self._cool_until = {}  # proxy → time.monotonic() at which it may be used again
         # TODO: Optionally, load proxies from a config file or environment if not provided
-    
+
     def get_proxy(self):
         """Retrieve the next proxy address to use.
 
+        Proxies in their cool-down are skipped. If every proxy is cooling down, rotation
+        continues over all of them rather than sending requests without a proxy.
+
         Returns:
             str or None: The proxy address string in the format expected by requests or Selenium, or None if no proxy is available.
         """
-        if not self.proxy_list:
-            return None
-        # Simple round-robin selection of proxies
-        proxy = self.proxy_list[self.index]
-        # Update index for next call
-        self.index = (self.index + 1) % len(self.proxy_list)
-        # TODO: Implement proxy health checking, removal of bad proxies, etc.
+        proxy = next(self._iter, None)
+        if proxy is None or not self._cool_until:
+            return proxy
+        now = time.monotonic()
+        for _ in range(len(self.proxy_list)):
+            until = self._cool_until.get(proxy)
+            if until is None:
+                return proxy
+            if until <= now:
+                del self._cool_until[proxy]
+                return proxy
+            proxy = next(self._iter)
         return proxy
+
+    def report_failure(self, proxy):
+        """Skip a proxy for the next `cooldown` seconds.
+
+        Args:
+            proxy (str): The proxy address a request failed through.
+        """
+        self._cool_until[proxy] = time.monotonic() + self.cooldown
+        logger.warning(f"[Proxy] Cooling down {proxy} for {self.cooldown:.0f}s")
+
+    def report_success(self, proxy):
+        """Put a proxy back into rotation immediately.
+
+        Args:
+            proxy (str): The proxy address a request succeeded through.
+        """
+        self._cool_until.pop(proxy, None)
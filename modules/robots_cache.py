@@ -0,0 +1,108 @@
+"""Asynchronous robots.txt cache for One_Touch_Plus.
+
+This module fetches robots.txt through the crawl's shared aiohttp session and keeps one parsed
+RobotFileParser per origin, reusing it until its Cache-Control max-age (or 24 hours) expires.
+Concurrent checks against an origin that is not cached yet wait on a per-origin lock, so
+robots.txt is fetched once rather than once per discovered link. Parsers are kept for the
+MAX_ORIGINS most recently used origins only, so broad crawls don't grow the cache without bound.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import urllib.robotparser
+from collections import OrderedDict, defaultdict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 60 * 60
+MAX_ORIGINS = 4096
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_parsers = OrderedDict()  # origin → (RobotFileParser, expires_at time.monotonic()); LRU order
+_locks = defaultdict(asyncio.Lock)  # origin → lock, only while its robots.txt is being fetched
+
+def _ttl(response: aiohttp.ClientResponse) -> int:
+    match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    return int(match.group(1)) if match else DEFAULT_TTL
+
+async def _fetch_parser(origin: str, session: aiohttp.ClientSession) -> tuple:
+    """
+    Fetch and parse an origin's robots.txt.
+
+    Follows RobotFileParser.read(): 401/403 disallow everything, other 4xx (e.g. 404) allow
+    everything. Network errors and 5xx responses also allow everything (fail open).
+
+    Returns:
+        tuple: (RobotFileParser, ttl in seconds).
+    """
+    robots_url = f"{origin}/robots.txt"
+    rp = urllib.robotparser.RobotFileParser(robots_url)
+    try:
+        async with session.get(robots_url) as response:
+            ttl = _ttl(response)
+            if response.status in (401, 403):
+                rp.disallow_all = True
+            elif response.status >= 400:
+                rp.allow_all = True
+            else:
+                rp.parse((await response.text(errors="replace")).splitlines())
+        logger.info(f"[robots_cache] Fetched robots.txt from {robots_url} ({response.status})")
+    except Exception as e:
+        logger.warning(f"[robots_cache] Failed to read robots.txt from {robots_url}: {e}")
+        rp.allow_all = True
+        ttl = DEFAULT_TTL
+    return rp, ttl
+
+async def get_parser(origin: str, session: aiohttp.ClientSession) -> urllib.robotparser.RobotFileParser:
+    """
+    Return the cached robots.txt parser for an origin, fetching it if missing or expired.
+
+    Args:
+        origin (str): Scheme and netloc, e.g. 'https://example.com'.
+        session (aiohttp.ClientSession): Shared HTTP session used for the fetch.
+
+    Returns:
+        RobotFileParser: The parsed rules.
+    """
+    entry = _parsers.get(origin)
+    if entry is not None and entry[1] > time.monotonic():
+        _parsers.move_to_end(origin)
+        return entry[0]
+    lock = _locks[origin]
+    try:
+        async with lock:
+            # Another task may have fetched it while this one waited for the lock.
+            entry = _parsers.get(origin)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            rp, ttl = await _fetch_parser(origin, session)
+            _parsers[origin] = (rp, time.monotonic() + ttl)
+            _parsers.move_to_end(origin)
+            if len(_parsers) > MAX_ORIGINS:
+                _parsers.popitem(last=False)
+            return rp
+    finally:
+        if not lock.locked() and _locks.get(origin) is lock:
+            del _locks[origin]  # No one else is waiting on this origin.
+
+async def is_allowed(url: str, session: aiohttp.ClientSession, user_agent: str = "*", split=None) -> bool:
+    """
+    Check if the given URL may be crawled according to its origin's robots.txt.
+
+    Args:
+        url (str): The URL to check.
+        session (aiohttp.ClientSession): Shared HTTP session used to fetch robots.txt.
+        user_agent (str): The user agent string to use for the check.
+        split (SplitResult, optional): The URL's urlsplit() result, if already computed.
+
+    Returns:
+        bool: True if allowed, False otherwise.
+    """
+    parts = split or urlsplit(url)
+    rp = await get_parser(f"{parts.scheme}://{parts.netloc}", session)
+    return rp.can_fetch(user_agent, url)
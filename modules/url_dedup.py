@@ -0,0 +1,83 @@
+"""URL deduplication for One_Touch_Plus.
+
+This module canonicalizes URLs so trivially different spellings of the same page (host case,
+default ports, fragments, query-parameter order) map to one key, and provides a SeenFilter
+that remembers keys in a scalable Bloom filter fronted by a small LRU of recent keys.
+"""
+
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from utils.bloom_filter import ScalableBloomFilter
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+def canonicalize(url: str, split=None) -> str:
+    """
+    Normalize a URL into its deduplication key.
+
+    Lowercases the scheme and host, strips the scheme's default port, drops the fragment,
+    sorts the query parameters and turns an empty path into "/".
+
+    Args:
+        url (str): The URL to canonicalize.
+        split (SplitResult, optional): The URL's urlsplit() result, if already computed.
+
+    Returns:
+        str: The canonical form of the URL.
+    """
+    parts = split or urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    host, sep, port = netloc.rpartition(":")
+    if sep and port == _DEFAULT_PORTS.get(scheme):
+        netloc = host
+    query = parts.query
+    if query:
+        query = urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+class SeenFilter:
+    """Remembers which keys have been seen, in a few bits per key."""
+    def __init__(self, initial_capacity: int = 1_000_000, error_rate: float = 1e-4,
+                 recent_size: int = 10_000, mode: int = ScalableBloomFilter.SMALL_SET_GROWTH):
+        """
+        Initialize an empty filter.
+
+        Args:
+            initial_capacity (int): Capacity of the first underlying Bloom filter.
+            error_rate (float): False-positive rate the Bloom filter stays under.
+            recent_size (int): Number of recently seen keys kept exactly in the LRU.
+            mode (int): Bloom filter growth factor (see ScalableBloomFilter).
+        """
+        self._bloom = ScalableBloomFilter(initial_capacity, error_rate, mode)
+        self._recent = OrderedDict()
+        self.recent_size = recent_size
+
+    def __contains__(self, key) -> bool:
+        return key in self._recent or key in self._bloom
+
+    def add_if_absent(self, key) -> bool:
+        """
+        Record a key, reporting whether it had been seen before.
+
+        Repeats of recently seen keys (links common to every page of a site) are answered
+        from the LRU without hashing the key.
+
+        Args:
+            key (str): The key to record, normally a canonicalize() result.
+
+        Returns:
+            bool: True if the key was (probably) already seen, False if it is new.
+        """
+        recent = self._recent
+        if key in recent:
+            recent.move_to_end(key)
+            return True
+        recent[key] = None
+        if len(recent) > self.recent_size:
+            recent.popitem(last=False)
+        return not self._bloom.add(key)
+
+    def __len__(self):
+        return len(self._bloom)
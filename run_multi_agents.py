@@ -4,14 +4,13 @@ This script loads the configuration and launches multiple crawl agents via the a
 """
 
 import os
-import yaml
 import asyncio
 from core.agent_dispatcher import launch_agents
+from modules.config_manager import load_yaml_cached
 
 if __name__ == "__main__":
     config_path = os.path.join("configs", "async_config.yaml")
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    config = load_yaml_cached(config_path)  # Parsed with libyaml's CSafeLoader when available
 
     # Full list of seed URLs.
     seed_targets = [
@@ -0,0 +1,8 @@
+"""Shared pytest setup: make the project packages importable when run from any directory."""
+
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
@@ -0,0 +1,31 @@
+"""Tests for CAPTCHA detection from a page's embedded resources."""
+
+import pytest
+
+from handlers.captcha_handler import detect_captcha
+
+@pytest.mark.parametrize("html", [
+    # Google reCAPTCHA widget iframe.
+    '<iframe src="https://www.google.com/recaptcha/api2/anchor?k=x"></iframe>',
+    # hCaptcha script on a provider subdomain.
+    '<script src="https://js.hcaptcha.com/1/api.js" async></script>',
+    # Cloudflare Turnstile, served from Cloudflare's challenge host.
+    '<script src="https://challenges.cloudflare.com/turnstile/v0/api.js"></script>',
+    # Cloudflare managed challenge page: relative challenge-platform scripts only.
+    '<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/chl_page/v1?ray=1"></script>',
+    # Self-hosted CAPTCHA image.
+    '<form action="/login"><img src="/captcha.php?id=7"><input name="code"></form>',
+    # Self-hosted CAPTCHA answer field.
+    '<form action="/login"><img src="/img/challenge.png"><input name="captcha"></form>',
+])
+def test_detects_captcha_shapes(html):
+    assert detect_captcha(f"<html><body>{html}</body></html>")
+
+@pytest.mark.parametrize("html", [
+    "<p>We never show a CAPTCHA to our customers.</p>",
+    '<script src="https://cdn.example.com/app.js"></script><img src="/logo.png">',
+    '<script src="http://[::1/broken.js"></script>',
+    "",
+])
+def test_ignores_pages_without_challenges(html):
+    assert not detect_captcha(html)
@@ -0,0 +1,64 @@
+"""Tests for CrawlManager scoring, deduplication and scheduling."""
+
+import pytest
+
+from core.crawl_manager import CrawlManager
+
+PRIORITY = {
+    "priority": {
+        "boost_keywords": ["/docs", "/api", "getting-started"],
+        "penalty_keywords": ["/legal", "/logout"],
+    }
+}
+
+def _drain(manager):
+    urls = []
+    while (item := manager.get_next_url()) is not None:
+        urls.append(item[0])
+    return urls
+
+def test_config_keywords_do_not_repeat_engine_adjustments():
+    manager = CrawlManager(exact_mode=True, config=PRIORITY)
+    # "docs" is already boosted by the scoring engine; "/docs" must not boost it again.
+    assert manager.score_url("http://x.test/docs/intro", {}) == 0.8
+    assert manager.score_url("http://x.test/legal", {}) == 1.3
+    # Keywords the engine doesn't know still apply.
+    assert manager.score_url("http://x.test/getting-started", {}) == 0.8
+
+def test_adjusted_scores_are_clamped_at_zero():
+    manager = CrawlManager(exact_mode=True, config={"priority": {"boost_keywords": ["intro"]}})
+    assert manager.score_url("http://x.test/docs/api/guide/reference/tutorial/intro", {}) == 0
+
+@pytest.mark.parametrize("exact_mode", [True, False])
+def test_canonical_duplicates_are_enqueued_once(exact_mode):
+    manager = CrawlManager(exact_mode=exact_mode)
+    assert manager.add_url("http://x.test/a?b=2&a=1", 0)
+    assert not manager.add_url("HTTP://X.test:80/a?a=1&b=2#top", 0)
+    assert manager.add_urls(["http://x.test/a?a=1&b=2", "http://x.test", "http://x.test/"], 1) == 1
+    assert sorted(_drain(manager)) == ["http://x.test", "http://x.test/a?b=2&a=1"]
+
+def test_out_of_depth_urls_are_skipped():
+    manager = CrawlManager(max_depth=1, exact_mode=True)
+    assert not manager.add_url("http://x.test/deep", 2)
+    assert manager.add_urls(["http://x.test/deeper"], 2) == 0
+    assert manager.get_next_url() is None
+
+def test_pops_best_score_first_within_a_domain():
+    manager = CrawlManager(exact_mode=True)
+    manager.add_urls(["http://x.test/legal", "http://x.test/blog", "http://x.test/docs/x"], 1)
+    assert _drain(manager) == ["http://x.test/docs/x", "http://x.test/blog", "http://x.test/legal"]
+
+def test_domains_are_served_round_robin():
+    manager = CrawlManager(exact_mode=True)
+    manager.add_urls([f"http://a.test/{i}" for i in range(3)] + ["http://b.test/0", "http://c.test/0"], 0)
+    hosts = [url.split("/")[2] for url in _drain(manager)]
+    assert hosts[:3] == ["a.test", "b.test", "c.test"]
+    assert hosts[3:] == ["a.test", "a.test"]
+
+def test_preferred_domain_is_drawn_out_of_turn():
+    manager = CrawlManager(exact_mode=True)
+    manager.add_urls(["http://a.test/0", "http://a.test/1", "http://b.test/0"], 0)
+    assert manager.get_next_url()[0].startswith("http://a.test/")
+    assert manager.get_next_url(preferred_domain="a.test")[0].startswith("http://a.test/")
+    assert manager.get_next_url(preferred_domain="a.test")[0] == "http://b.test/0"
+    assert manager.get_next_url() is None
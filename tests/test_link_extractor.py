@@ -0,0 +1,28 @@
+"""Tests for link extraction and filtering."""
+
+from modules.link_extractor import extract_links
+
+def _links(hrefs, base_url="http://example.com/page", config=None):
+    html = "".join(f'<a href="{href}">x</a>' for href in hrefs)
+    return sorted(extract_links(html, base_url, config or {}))
+
+def test_keeps_same_domain_links_with_uppercase_scheme():
+    assert _links(["HTTPS://example.com/docs/x", "Http://example.com/a"]) == [
+        "HTTPS://example.com/docs/x", "http://example.com/a",
+    ]
+
+def test_drops_other_hosts_including_lookalike_prefixes():
+    assert _links([
+        "https://other.com/x", "http://example.com.evil.net/x", "HTTP://other.com/y", "/local",
+    ]) == ["http://example.com/local"]
+
+def test_query_key_exclusion_matches_decoded_keys():
+    assert _links(["/a?%72ef=1", "/b?utm_source=x", "/c?ref", "/d?page=2"]) == [
+        "http://example.com/c?ref", "http://example.com/d?page=2",
+    ]
+
+def test_malformed_href_is_skipped_not_fatal():
+    assert _links(["https://[::1/x", "http://[bad", "/ok"]) == ["http://example.com/ok"]
+    assert _links(["https://[::1/x", "/ok"], config={"crawl": {"same_domain_only": False}}) == [
+        "http://example.com/ok",
+    ]
@@ -0,0 +1,77 @@
+"""Tests for OutputReporter's SQLite schema migrations."""
+
+import sqlite3
+from contextlib import closing
+
+from modules.output_reporter import DOMAIN_SQL, SCHEMA_VERSION, OutputReporter, schema_version
+
+# scraped_data as the original reporter created it: no ts_epoch, no domain, no user_version.
+_OLD_SCHEMA_SQL = """
+    CREATE TABLE scraped_data (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT,
+        title TEXT,
+        snippet TEXT,
+        html TEXT,
+        timestamp TEXT
+    )
+"""
+
+def _old_database(path, domain_index=False):
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute(_OLD_SCHEMA_SQL)
+        conn.execute(
+            "INSERT INTO scraped_data (url, title, snippet, html, timestamp) VALUES (?, ?, ?, ?, ?)",
+            ("https://old.test/page", "Old", "", None, "20240102_030405"),
+        )
+        if domain_index:
+            # The dashboard once added the domain column and a (domain, timestamp) index itself.
+            conn.execute(
+                f"ALTER TABLE scraped_data ADD COLUMN domain TEXT GENERATED ALWAYS AS ({DOMAIN_SQL}) VIRTUAL"
+            )
+            conn.execute("CREATE INDEX idx_domain_ts ON scraped_data(domain, timestamp)")
+        conn.commit()
+
+def _report(tmp_path, db_path, records):
+    reporter = OutputReporter(
+        {"output_format": "sqlite", "db_path": str(db_path), "output_dir": str(tmp_path)}
+    )
+    for record in records:
+        reporter.generate_report(record)
+    reporter.finalize()
+
+def _indexes(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def test_old_database_is_migrated_on_first_write(tmp_path):
+    db_path = tmp_path / "crawler.db"
+    _old_database(db_path)
+    _report(tmp_path, db_path, [{"url": "https://new.test/a", "title": "New", "snippet": "s"}])
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+        assert {"idx_ts", "idx_domain_epoch"} <= _indexes(conn)
+        rows = conn.execute("SELECT url, domain, ts_epoch FROM scraped_data ORDER BY id").fetchall()
+    assert rows[0] == ("https://old.test/page", "old.test", 1704164645)  # 2024-01-02 03:04:05 UTC
+    assert rows[1][:2] == ("https://new.test/a", "new.test")
+    assert rows[1][2] > rows[0][2]
+
+def test_unversioned_domain_index_is_replaced(tmp_path):
+    db_path = tmp_path / "crawler.db"
+    _old_database(db_path, domain_index=True)
+    _report(tmp_path, db_path, [{"url": "https://new.test/a", "title": "New", "snippet": "s"}])
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+        indexes = _indexes(conn)
+        assert "idx_domain_ts" not in indexes
+        assert "idx_domain_epoch" in indexes
+        assert conn.execute("SELECT count(*) FROM scraped_data WHERE ts_epoch IS NOT NULL").fetchone()[0] == 2
+
+def test_new_database_starts_at_current_version(tmp_path):
+    db_path = tmp_path / "crawler.db"
+    _report(tmp_path, db_path, [{"url": "https://new.test/a", "title": "New", "snippet": "s"}])
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert schema_version(conn) == SCHEMA_VERSION
+        assert conn.execute("SELECT domain FROM scraped_data").fetchall() == [("new.test",)]
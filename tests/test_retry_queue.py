@@ -0,0 +1,47 @@
+"""Tests for RetryQueue backoff and its hand-off to the crawl's work queue."""
+
+import asyncio
+
+from core.retry_queue import RetryQueue
+
+def test_add_respects_max_retries():
+    async def scenario():
+        retries = RetryQueue(max_retries=2)
+        assert retries.add("http://x.test/", 0, attempt=2, delay=0)
+        assert not retries.add("http://x.test/", 0, attempt=3, delay=0)
+        assert len(retries) == 1
+
+    asyncio.run(scenario())
+
+def test_delay_is_capped_and_jittered():
+    retries = RetryQueue(base=1.0, backoff=2, cap=5.0, jitter=0.5)
+    assert all(0.5 <= retries.delay_for(2) <= 1.5 for _ in range(100))
+    assert all(2.5 <= retries.delay_for(10) <= 7.5 for _ in range(100))
+
+def test_dispatch_hands_retries_to_workers_before_join_completes():
+    async def scenario():
+        queue = asyncio.Queue()
+        retries = RetryQueue()
+        attempts = []
+
+        async def worker():
+            # Mirrors crawl_worker: a failing attempt keeps its unit for the dispatcher to release.
+            while True:
+                await queue.get()
+                url, depth, attempt = retries.pop_ready() or ("http://x.test/", 0, 1)
+                attempts.append(attempt)
+                if attempt < 3 and retries.add(url, depth, attempt + 1, delay=0.01):
+                    continue
+                queue.task_done()
+
+        queue.put_nowait(None)
+        async with asyncio.TaskGroup() as tg:
+            dispatcher = tg.create_task(retries.dispatch(queue))
+            workers = [tg.create_task(worker()) for _ in range(2)]
+            await asyncio.wait_for(queue.join(), timeout=5)
+            dispatcher.cancel()
+            for task in workers:
+                task.cancel()
+        return attempts
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
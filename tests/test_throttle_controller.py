@@ -0,0 +1,47 @@
+"""Tests for per-domain throttling and the DomainHealth circuit breaker."""
+
+import asyncio
+import time
+
+from core.throttle_controller import ThrottleController
+
+def test_burst_goes_out_at_once_then_requests_are_spaced_by_rate():
+    throttler = ThrottleController({"crawl": {"rps": 20, "burst": 3}})
+
+    async def scenario():
+        start = time.monotonic()
+        offsets = []
+        for _ in range(5):
+            await throttler.throttle("http://x.test/", "x.test")
+            offsets.append(time.monotonic() - start)
+        return offsets
+
+    offsets = asyncio.run(scenario())
+    assert offsets[2] < 0.03
+    assert 0.04 <= offsets[3] < 0.09
+    assert 0.09 <= offsets[4] < 0.14
+
+def test_has_budget_tracks_each_domain_separately():
+    throttler = ThrottleController({"crawl": {"rps": 1, "burst": 2}})
+
+    async def scenario():
+        for _ in range(2):
+            await throttler.throttle("http://x.test/", "x.test")
+
+    asyncio.run(scenario())
+    assert not throttler.has_budget("x.test")
+    assert throttler.has_budget("y.test")
+
+def test_request_delay_zero_disables_throttling():
+    throttler = ThrottleController({"crawl": {"request_delay": 0}})
+    assert throttler.has_budget("x.test")
+    asyncio.run(throttler.throttle("http://x.test/"))
+
+def test_health_thresholds_come_from_the_crawl_config():
+    throttler = ThrottleController({"crawl": {"health_min_samples": 2, "health_cooldown": 5}})
+    health = throttler.health
+    health.record("x.test", False)
+    assert not health.is_open("x.test")
+    health.record("x.test", False)
+    assert health.is_open("x.test")
+    assert 4 < health.remaining("x.test") <= 5
@@ -0,0 +1,125 @@
+"""Bloom filters for One_Touch_Plus.
+
+This module provides a fixed-size BloomFilter and a ScalableBloomFilter that grows by adding
+progressively larger, tighter filters as it fills up. They answer "have I seen this key?" in
+a few bits per key instead of keeping every key in memory, at the cost of a small, bounded
+false-positive rate. Keys are hashed once with blake2b and the bit positions are derived
+from that single digest (double hashing).
+"""
+
+import hashlib
+import math
+
+def _hash_pair(key) -> tuple:
+    """Return two 64-bit hashes of a str or bytes key from one blake2b digest."""
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+class BloomFilter:
+    """A fixed-capacity Bloom filter backed by a bytearray."""
+    def __init__(self, capacity: int, error_rate: float):
+        """
+        Size the filter for the given capacity and false-positive rate.
+
+        Args:
+            capacity (int): Number of keys the filter is sized for.
+            error_rate (float): Target false-positive rate at full capacity.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, hashes: tuple):
+        h1, h2 = hashes
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def _contains_hashes(self, hashes: tuple) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(hashes))
+
+    def _add_hashes(self, hashes: tuple) -> bool:
+        """Set the key's bits; return True if any bit was previously unset (key was new)."""
+        bits = self.bits
+        new = False
+        for pos in self._positions(hashes):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key) -> bool:
+        return self._contains_hashes(_hash_pair(key))
+
+    def add(self, key) -> bool:
+        """
+        Add a key to the filter.
+
+        Args:
+            key (str or bytes): The key to add.
+
+        Returns:
+            bool: True if the key was not (probably) present before.
+        """
+        return self._add_hashes(_hash_pair(key))
+
+    def __len__(self):
+        return self.count
+
+class ScalableBloomFilter:
+    """A Bloom filter that keeps its false-positive rate bounded as it grows."""
+    SMALL_SET_GROWTH = 2
+    LARGE_SET_GROWTH = 4
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 1e-4,
+                 mode: int = SMALL_SET_GROWTH, ratio: float = 0.9):
+        """
+        Initialize an empty scalable filter.
+
+        Args:
+            initial_capacity (int): Capacity of the first underlying filter.
+            error_rate (float): Overall false-positive rate to stay under.
+            mode (int): Capacity multiplier applied to each new filter.
+            ratio (float): Error-rate tightening factor applied to each new filter.
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.mode = mode
+        self.ratio = ratio
+        self.filters = []
+
+    def __contains__(self, key) -> bool:
+        hashes = _hash_pair(key)
+        return any(f._contains_hashes(hashes) for f in reversed(self.filters))
+
+    def add(self, key) -> bool:
+        """
+        Add a key, starting a new, larger filter once the current one is full.
+
+        Args:
+            key (str or bytes): The key to add.
+
+        Returns:
+            bool: True if the key was not (probably) present before.
+        """
+        hashes = _hash_pair(key)
+        if any(f._contains_hashes(hashes) for f in reversed(self.filters)):
+            return False
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            n = len(self.filters)
+            self.filters.append(BloomFilter(
+                capacity=self.initial_capacity * self.mode ** n,
+                error_rate=self.error_rate * (1 - self.ratio) * self.ratio ** n,
+            ))
+        return self.filters[-1]._add_hashes(hashes)
+
+    def __len__(self):
+        return sum(f.count for f in self.filters)
@@ -0,0 +1,37 @@
+"""Logging setup for One_Touch_Plus.
+
+Entry points call configure_logging instead of logging.basicConfig. Records are put on an
+in-memory queue by a QueueHandler and written out by a QueueListener on a background thread,
+so the event loop never blocks on handler locks or slow terminal/file writes.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+def configure_logging(level=logging.INFO, fmt: str = None, handlers: list = None):
+    """
+    Route root logging through a queue drained by a background thread.
+
+    Like logging.basicConfig, this does nothing if the root logger already has handlers.
+
+    Args:
+        level (int): Root logger level.
+        fmt (str, optional): Format string for the output handlers.
+        handlers (list, optional): Handlers that do the actual writing; a StreamHandler
+            to stderr if none are given.
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handlers = handlers or [logging.StreamHandler()]
+    formatter = logging.Formatter(fmt or logging.BASIC_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # Flushes queued records on interpreter exit.
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level)
@@ -0,0 +1,52 @@
+"""Shared worker pool for OCR-style handlers in One_Touch_Plus.
+
+PDF and image handlers accept batches and fan them out over one lazily created thread pool.
+OCR engines (tesseract via pytesseract, or tesserocr) do their work outside the GIL, so
+threads give real parallelism without the pickling cost of a process pool, and per-thread
+engine state can be initialized once and reused across items.
+"""
+
+import concurrent.futures
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(config: dict) -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Return the process-wide OCR pool, creating it on first use.
+
+    Args:
+        config (dict): Scraper configuration; 'ocr.workers' sets the pool size (default: CPU count).
+
+    Returns:
+        ThreadPoolExecutor: The shared pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = config.get("ocr", {}).get("workers") or os.cpu_count() or 1
+                _pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr")
+                logger.info(f"[OCR] Started pool with {workers} workers")
+    return _pool
+
+def map_batch(func, items: list, config: dict) -> list:
+    """
+    Apply func(item, config) to every item on the shared pool.
+
+    Args:
+        func (callable): Single-item handler.
+        items (list): Items to process.
+        config (dict): Scraper configuration, passed through to func.
+
+    Returns:
+        list: Results in the same order as items.
+    """
+    if len(items) <= 1:
+        return [func(item, config) for item in items]
+    return list(get_pool(config).map(func, items, [config] * len(items)))